@@ -283,7 +283,7 @@ class NewsAgentAPI:
             
             elif request.action == "stop":
                 if self.scheduler:
-                    self.scheduler.is_running = False
+                    self.scheduler.stop()
                     self.scheduler = None
                 
                 return {
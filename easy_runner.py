@@ -106,8 +106,7 @@ class NewsAgentInstaller:
             'lxml>=4.9.0',
             'nltk>=3.8',
             'textstat>=0.7.3',
-            'python-dotenv>=1.0.0',
-            'schedule>=1.2.0'
+            'python-dotenv>=1.0.0'
         ]
         
         # Optional packages (ask user)
@@ -17,10 +17,9 @@ from datetime import datetime, timedelta
 from urllib.parse import urljoin, urlparse
 import hashlib
 import sqlite3
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Iterator, Optional, Tuple, Union
 import re
 from pathlib import Path
-import schedule
 from dataclasses import dataclass
 import threading
 
@@ -58,6 +57,12 @@ except ImportError:
     NLTK_AVAILABLE = False
     print("📝 NLTK not available. Install with: pip install nltk textstat")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -66,6 +71,25 @@ except ImportError:
     DOTENV_AVAILABLE = False
     print("📝 python-dotenv not available. Install with: pip install python-dotenv")
 
+def dumps_json_bytes(data) -> bytes:
+    """Serialize to indented UTF-8 JSON, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        )
+    return (json.dumps(data, indent=2, ensure_ascii=False) + "\n").encode('utf-8')
+
+def dumps_json_line(data) -> bytes:
+    """Serialize to one line of compact UTF-8 JSON, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(data, ensure_ascii=False, separators=(',', ':')) + "\n").encode('utf-8')
+
+def dumps_json_nested(data, level: int) -> bytes:
+    """dumps_json_bytes output re-indented to sit `level` levels deep in an enclosing document"""
+    return dumps_json_bytes(data).rstrip(b"\n").replace(b"\n", b"\n" + b"  " * level)
+
 @dataclass
 class NewsConfig:
     """Configuration for the news agent"""
@@ -151,9 +175,11 @@ class IntegratedNewsAgent:
         self.logger = logging.getLogger("NewsAgent")
         self.logger.setLevel(getattr(logging, self.config.log_level))
         
-        # Remove existing handlers
+        # Remove handlers added by an earlier setup; handlers attached by
+        # others (such as the web dashboard's log stream) are kept
         for handler in self.logger.handlers[:]:
-            self.logger.removeHandler(handler)
+            if getattr(handler, 'news_agent_handler', False):
+                self.logger.removeHandler(handler)
         
         # File handler
         file_handler = logging.FileHandler(
@@ -171,6 +197,8 @@ class IntegratedNewsAgent:
         )
         file_handler.setFormatter(formatter)
         console_handler.setFormatter(formatter)
+        file_handler.news_agent_handler = True
+        console_handler.news_agent_handler = True
         
         self.logger.addHandler(file_handler)
         self.logger.addHandler(console_handler)
@@ -210,12 +238,26 @@ class IntegratedNewsAgent:
             "CREATE INDEX IF NOT EXISTS idx_source ON articles(source)",
             "CREATE INDEX IF NOT EXISTS idx_scraped_at ON articles(scraped_at)",
             "CREATE INDEX IF NOT EXISTS idx_content_hash ON articles(content_hash)",
-            "CREATE INDEX IF NOT EXISTS idx_category ON articles(category)"
+            "CREATE INDEX IF NOT EXISTS idx_category ON articles(category)",
+            # Covering index for the dashboard's time-window aggregations
+            "CREATE INDEX IF NOT EXISTS idx_articles_stats ON articles(scraped_at, source, category)"
         ]
         
+        existing = {row[0] for row in self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        )}
         for index in indexes:
             self.conn.execute(index)
         
+        # The daily trend now reads daily_stats, so this only cost inserts
+        self.conn.execute("DROP INDEX IF EXISTS idx_articles_date")
+        
+        # Refresh planner statistics only when an index was just created,
+        # since ANALYZE scans the table and every index
+        created = {index.split()[5] for index in indexes} - existing
+        if created:
+            self.conn.execute("ANALYZE")
+        
         # Create scraping_stats table
         self.conn.execute('''
             CREATE TABLE IF NOT EXISTS scraping_stats (
@@ -228,6 +270,45 @@ class IntegratedNewsAgent:
             )
         ''')
         
+        # Daily rollup maintained alongside article inserts so trend queries
+        # read a handful of rows instead of scanning articles
+        rollup_exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_stats'"
+        ).fetchone()
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS daily_stats (
+                date TEXT NOT NULL,
+                source TEXT NOT NULL,
+                category TEXT NOT NULL DEFAULT '',
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (date, source, category)
+            )
+        ''')
+        if not rollup_exists:
+            # Backfill from articles already in the database
+            self.conn.execute('''
+                INSERT INTO daily_stats (date, source, category, count)
+                SELECT DATE(scraped_at), source, COALESCE(category, ''), COUNT(*)
+                FROM articles
+                GROUP BY 1, 2, 3
+            ''')
+        
+        # Running totals kept in step with inserts and cleanups so the
+        # dashboard does not need COUNT(*) scans
+        meta_exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats_meta'"
+        ).fetchone()
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS stats_meta (
+                k TEXT PRIMARY KEY,
+                v INTEGER NOT NULL
+            )
+        ''')
+        if not meta_exists:
+            self.conn.execute(
+                "INSERT INTO stats_meta (k, v) SELECT 'articles_total', COUNT(*) FROM articles"
+            )
+        
         self.conn.commit()
     
     def setup_summarization(self, openai_api_key: Optional[str], huggingface_api_key: Optional[str]):
@@ -938,24 +1019,31 @@ class IntegratedNewsAgent:
     def save_article(self, article: Dict, summary: str):
         """Save article to database with enhanced fields"""
         try:
-            self.conn.execute('''
-                INSERT INTO articles (
-                    url, title, content, summary, source, category,
-                    content_hash, word_count, reading_time, tags
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                article['url'],
-                article['title'],
-                article['content'],
-                summary,
-                article['source'],
-                article['category'],
-                article['content_hash'],
-                article['word_count'],
-                article['reading_time'],
-                article.get('tags')
-            ))
-            self.conn.commit()
+            # The counters must move with the row, or they drift from articles
+            with self.conn:
+                self.conn.execute('''
+                    INSERT INTO articles (
+                        url, title, content, summary, source, category,
+                        content_hash, word_count, reading_time, tags
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    article['url'],
+                    article['title'],
+                    article['content'],
+                    summary,
+                    article['source'],
+                    article['category'],
+                    article['content_hash'],
+                    article['word_count'],
+                    article['reading_time'],
+                    article.get('tags')
+                ))
+                self.conn.execute('''
+                    INSERT INTO daily_stats (date, source, category, count)
+                    VALUES (DATE('now'), ?, ?, 1)
+                    ON CONFLICT (date, source, category) DO UPDATE SET count = count + 1
+                ''', (article['source'], article['category'] or ''))
+                self.conn.execute("UPDATE stats_meta SET v = v + 1 WHERE k = 'articles_total'")
             self.log("debug", f"💾 Saved: {article['title'][:50]}...")
         except sqlite3.IntegrityError:
             self.log("debug", f"🔄 Duplicate skipped: {article['url']}")
@@ -1096,13 +1184,23 @@ class IntegratedNewsAgent:
         except Exception as e:
             self.log("error", f"❌ Error saving stats: {e}")
     
-    def get_recent_summaries(self, hours: int = 24, source: str = None, category: str = None) -> List[Dict]:
-        """Get recent articles with optional filtering"""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
+    def iter_recent_summaries(self, hours: int = 24, source: str = None, category: str = None,
+                              conn: Optional[sqlite3.Connection] = None, limit: Optional[int] = None,
+                              after: Optional[Tuple[str, int]] = None,
+                              cutoff: Optional[datetime] = None) -> Iterator[Dict]:
+        """Yield recent articles, newest first by (scraped_at, id)
+        
+        Args:
+            conn: Connection to read from (defaults to the agent's own)
+            limit: Maximum number of rows to yield
+            after: (scraped_at, id) of the last row of the previous page
+            cutoff: Oldest scraped_at to include (overrides hours)
+        """
+        cutoff_time = cutoff or datetime.now() - timedelta(hours=hours)
         
         query = '''
-            SELECT title, summary, source, category, url, scraped_at, 
-                   word_count, reading_time, tags
+            SELECT title, summary, source, category, url, scraped_at,
+                   word_count, reading_time, tags, id
             FROM articles WHERE scraped_at > ?
         '''
         params = [cutoff_time]
@@ -1115,11 +1213,18 @@ class IntegratedNewsAgent:
             query += ' AND category = ?'
             params.append(category)
         
-        query += ' ORDER BY scraped_at DESC'
+        if after:
+            query += ' AND (scraped_at, id) < (?, ?)'
+            params.extend(after)
         
-        try:
-            cursor = self.conn.execute(query, params)
-            return [{
+        query += ' ORDER BY scraped_at DESC, id DESC'
+        
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
+        
+        for row in (conn or self.conn).execute(query, params):
+            yield {
                 'title': row[0],
                 'summary': row[1],
                 'source': row[2],
@@ -1128,15 +1233,25 @@ class IntegratedNewsAgent:
                 'scraped_at': row[5],
                 'word_count': row[6],
                 'reading_time': row[7],
-                'tags': row[8]
-            } for row in cursor.fetchall()]
+                'tags': row[8],
+                'id': row[9]
+            }
+    
+    def get_recent_summaries(self, hours: int = 24, source: str = None, category: str = None) -> List[Dict]:
+        """Get recent articles with optional filtering"""
+        try:
+            return list(self.iter_recent_summaries(hours, source, category))
         except Exception as e:
             self.log("error", f"❌ Error getting recent summaries: {e}")
             return []
-    
-    def generate_comprehensive_report(self, hours: int = 24) -> str:
-        """Generate comprehensive news report with statistics"""
-        recent_articles = self.get_recent_summaries(hours)
+
+    def generate_comprehensive_report(self, hours: int = 24, articles: Optional[List[Dict]] = None) -> str:
+        """Generate comprehensive news report with statistics
+        
+        Args:
+            articles: Already-fetched get_recent_summaries(hours) rows to reuse
+        """
+        recent_articles = self.get_recent_summaries(hours) if articles is None else articles
         
         if not recent_articles:
             return f"📰 No new articles found in the last {hours} hours."
@@ -1209,8 +1324,6 @@ class IntegratedNewsAgent:
     
     def export_to_json(self, hours: int = 24, filename: str = None) -> str:
         """Export recent articles to JSON"""
-        articles = self.get_recent_summaries(hours)
-        
         if not filename:
             filename = f"news_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
@@ -1218,34 +1331,56 @@ class IntegratedNewsAgent:
         Path("exports").mkdir(exist_ok=True)
         filepath = Path("exports") / filename
         
-        export_data = {
-            'export_info': {
+        with open(filepath, 'wb') as f:
+            f.writelines(self.iter_export_json(hours))
+        
+        self.log("info", f"📁 Exported last {hours}h of articles to {filepath}")
+        return str(filepath)
+    
+    def iter_export_json(self, hours: int = 24, conn: Optional[sqlite3.Connection] = None) -> Iterator[bytes]:
+        """Yield the export document as UTF-8 JSON chunks, one article at a time"""
+        conn = conn or self.conn
+        cutoff_time = datetime.now() - timedelta(hours=hours)
+        
+        own_transaction = not conn.in_transaction
+        if own_transaction:
+            conn.execute('BEGIN')
+        try:
+            total_articles = conn.execute(
+                'SELECT COUNT(*) FROM articles WHERE scraped_at > ?', (cutoff_time,)
+            ).fetchone()[0]
+            
+            export_info = {
                 'timestamp': datetime.now().isoformat(),
-                'total_articles': len(articles),
+                'total_articles': total_articles,
                 'period_hours': hours,
                 'summarization_method': self.summarization_method,
                 'agent_version': '2.1-fixed'
-            },
-            'articles': articles,
-            'statistics': {
-                'sources': {},
-                'categories': {},
-                'total_reading_time': sum(a.get('reading_time', 0) for a in articles)
             }
-        }
-        
-        # Calculate statistics
-        for article in articles:
-            source = article['source']
-            category = article['category']
-            export_data['statistics']['sources'][source] = export_data['statistics']['sources'].get(source, 0) + 1
-            export_data['statistics']['categories'][category] = export_data['statistics']['categories'].get(category, 0) + 1
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
-        
-        self.log("info", f"📁 Exported {len(articles)} articles to {filepath}")
-        return str(filepath)
+            yield b'{\n  "export_info": ' + dumps_json_nested(export_info, 1) + b',\n  "articles": ['
+            
+            statistics = {'sources': {}, 'categories': {}, 'total_reading_time': 0}
+            sent = 0
+            for article in self.iter_recent_summaries(hours, conn=conn, cutoff=cutoff_time):
+                source = article['source']
+                category = article['category']
+                statistics['sources'][source] = statistics['sources'].get(source, 0) + 1
+                statistics['categories'][category] = statistics['categories'].get(category, 0) + 1
+                statistics['total_reading_time'] += article['reading_time'] or 0
+                
+                yield (b',\n    ' if sent else b'\n    ') + dumps_json_nested(article, 2)
+                sent += 1
+            
+            yield ((b'\n  ]' if sent else b']') + b',\n  "statistics": '
+                   + dumps_json_nested(statistics, 1) + b'\n}\n')
+        finally:
+            if own_transaction:
+                conn.execute('COMMIT')
+    
+    def iter_export_ndjson(self, hours: int = 24, conn: Optional[sqlite3.Connection] = None) -> Iterator[bytes]:
+        """Yield recent articles as newline-delimited JSON, one line per article"""
+        for article in self.iter_recent_summaries(hours, conn=conn):
+            yield dumps_json_line(article)
     
     def cleanup_old_articles(self, days: int = 30) -> int:
         """Clean up old articles"""
@@ -1256,6 +1391,24 @@ class IntegratedNewsAgent:
                 (cutoff_date,)
             )
             deleted_count = cursor.rowcount
+            
+            # Rebuild rollup rows for the days touched by the delete
+            if deleted_count:
+                self.conn.execute(
+                    "DELETE FROM daily_stats WHERE date <= DATE(?)",
+                    (cutoff_date,)
+                )
+                self.conn.execute('''
+                    INSERT INTO daily_stats (date, source, category, count)
+                    SELECT DATE(scraped_at), source, COALESCE(category, ''), COUNT(*)
+                    FROM articles
+                    WHERE scraped_at < DATE(?, '+1 day')
+                    GROUP BY 1, 2, 3
+                ''', (cutoff_date,))
+                self.conn.execute(
+                    "UPDATE stats_meta SET v = v - ? WHERE k = 'articles_total'",
+                    (deleted_count,)
+                )
             self.conn.commit()
             
             self.log("info", f"🧹 Cleaned up {deleted_count} articles older than {days} days")
@@ -1264,12 +1417,18 @@ class IntegratedNewsAgent:
             self.log("error", f"❌ Cleanup error: {e}")
             return 0
     
-    def get_trending_topics(self, hours: int = 24, limit: int = 15) -> List[Dict]:
-        """Enhanced trending topics analysis"""
+    def get_trending_topics(self, hours: int = 24, limit: int = 15,
+                            articles: Optional[List[Dict]] = None) -> List[Dict]:
+        """Enhanced trending topics analysis
+        
+        Args:
+            articles: Already-fetched get_recent_summaries(hours) rows to reuse
+        """
         if not NLTK_AVAILABLE:
             return []
         
-        articles = self.get_recent_summaries(hours)
+        if articles is None:
+            articles = self.get_recent_summaries(hours)
         if not articles:
             return []
         
@@ -1327,11 +1486,28 @@ class EnhancedNewsScheduler:
         self.run_count = 0
         self.last_run_time = None
         self.last_run_articles = 0
+        self.interval_hours = None
+        self._wake = threading.Event()
     
     def start_scheduler(self, interval_hours: int = 2, max_runs: int = None):
-        """Start enhanced scheduled news scraping"""
-        schedule.every(interval_hours).hours.do(self.scheduled_job)
+        """Start enhanced scheduled news scraping (blocking)"""
+        try:
+            self.run_forever(interval_hours=interval_hours, max_runs=max_runs)
+        except KeyboardInterrupt:
+            print(f"\n🛑 Scheduler stopped by user after {self.run_count} runs")
+        finally:
+            self.is_running = False
+    
+    def stop(self):
+        """Stop the scheduler, waking it if it is waiting for the next run"""
+        self.is_running = False
+        self._wake.set()
+    
+    def run_forever(self, interval_hours: int = 2, max_runs: int = None):
+        """Run the scheduled job every interval_hours until stopped (blocking)"""
+        self.interval_hours = interval_hours
         self.is_running = True
+        self._wake.clear()
         
         print(f"📅 Enhanced News Scheduler Started")
         print(f"⏰ Running every {interval_hours} hours")
@@ -1340,19 +1516,26 @@ class EnhancedNewsScheduler:
         print(f"🛑 Press Ctrl+C to stop")
         print("=" * 50)
         
+        next_run = time.monotonic() + interval_hours * 3600
+        
         try:
             while self.is_running:
-                schedule.run_pending()
+                # stop() wakes the wait at once; waiting at most a minute at a
+                # time also notices is_running being cleared directly
+                remaining = next_run - time.monotonic()
+                if remaining > 0:
+                    self._wake.wait(min(remaining, 60))
+                    continue
+                
+                # Runs on the calling thread: the agent's SQLite connection
+                # is bound to the thread that created it
+                self.scheduled_job()
+                next_run = time.monotonic() + interval_hours * 3600
                 
                 # Stop if max runs reached
                 if max_runs and self.run_count >= max_runs:
                     print(f"\n✅ Maximum runs ({max_runs}) completed. Stopping scheduler.")
                     break
-                
-                time.sleep(60)  # Check every minute
-                
-        except KeyboardInterrupt:
-            print(f"\n🛑 Scheduler stopped by user after {self.run_count} runs")
         finally:
             self.is_running = False
     
@@ -1398,7 +1581,7 @@ class EnhancedNewsScheduler:
                     )
                     print(f"   💾 Auto-exported: {export_file}")
             
-            print(f"   ✅ Next run in {schedule.jobs[0].interval} hours")
+            print(f"   ✅ Next run in {self.interval_hours} hours")
             
         except Exception as e:
             print(f"   ❌ Error in scheduled run: {e}")
@@ -4,17 +4,83 @@ Easy Runner for Integrated News Agent
 Simple interface for running the complete news scraping system
 """
 
+import argparse
 import os
 import sys
+from collections import Counter
 from datetime import datetime
+from itertools import chain, islice
+
+BANNER = (
+    "=" * 70 + "\n"
+    "🤖 INTEGRATED NEWS SCRAPING AGENT v2.0\n"
+    + "=" * 70 + "\n"
+    "🌐 Sources: LiveMint, MoneyControl, Economic Times, Business Standard\n"
+    "🧠 AI Summarization: OpenAI, Hugging Face, Local\n"
+    "📊 Features: Reports, Exports, Trending Analysis, Scheduling\n"
+    + "=" * 70 + "\n"
+)
+
+API_SETUP_MENU = """
+🔑 API KEY SETUP:
+Choose your summarization method:
+1. Local summarization (Free, Basic quality)
+2. OpenAI GPT (Paid, Excellent quality)
+3. Hugging Face (Free tier, Good quality)
+"""
+
+EXECUTION_MODE_MENU = """
+⚙️ EXECUTION MODE:
+1. Quick run (5-10 minutes, get latest news)
+2. Complete run (15-20 minutes, comprehensive)
+3. Scheduled operation (run automatically)
+4. Interactive mode (full control)
+"""
+
+MODE_CHOICES = {
+    'quick': '1',
+    'complete': '2',
+    'scheduled': '3',
+    'interactive': '4'
+}
+
+def is_interactive() -> bool:
+    """Check whether we can prompt the user (False under cron/systemd/CI)"""
+    return sys.stdin.isatty()
+
+def ask(message: str, default: str = "") -> str:
+    """Prompt the user, or return the default when running non-interactively"""
+    if not is_interactive():
+        return default
+    return input(message).strip() or default
+
+def parse_args(argv=None):
+    """Parse command line options for unattended runs"""
+    parser = argparse.ArgumentParser(
+        description="Easy runner for the Integrated News Agent"
+    )
+    parser.add_argument('--mode', choices=list(MODE_CHOICES),
+                        help="Execution mode (skips the interactive menu)")
+    parser.add_argument('--openai-key', help="OpenAI API key")
+    parser.add_argument('--hf-key', help="Hugging Face API key")
+    parser.add_argument('--hours', type=int, default=None,
+                        help="Scheduled mode: run every X hours (default: 2)")
+    parser.add_argument('--max-runs', type=int, default=None,
+                        help="Scheduled mode: maximum runs (default: unlimited)")
+    args = parser.parse_args(argv)
+    
+    # Interactive mode reads from stdin, which would block or fail here
+    if args.mode == 'interactive' and not is_interactive():
+        parser.error("--mode interactive needs a terminal; use quick, complete "
+                     "or scheduled when running unattended")
+    return args
 
 def check_dependencies():
     """Check if required packages are installed"""
     required_packages = {
         'requests': 'requests',
         'bs4': 'beautifulsoup4',
-        'nltk': 'nltk',
-        'schedule': 'schedule'
+        'nltk': 'nltk'
     }
     
     missing = []
@@ -54,33 +120,23 @@ def download_nltk_data():
 
 def print_banner():
     """Print welcome banner"""
-    print("=" * 70)
-    print("🤖 INTEGRATED NEWS SCRAPING AGENT v2.0")
-    print("=" * 70)
-    print("🌐 Sources: LiveMint, MoneyControl, Economic Times, Business Standard")
-    print("🧠 AI Summarization: OpenAI, Hugging Face, Local")
-    print("📊 Features: Reports, Exports, Trending Analysis, Scheduling")
-    print("=" * 70)
+    sys.stdout.write(BANNER)
 
 def get_api_setup():
     """Get API key setup from user"""
-    print("\n🔑 API KEY SETUP:")
-    print("Choose your summarization method:")
-    print("1. Local summarization (Free, Basic quality)")
-    print("2. OpenAI GPT (Paid, Excellent quality)")
-    print("3. Hugging Face (Free tier, Good quality)")
+    sys.stdout.write(API_SETUP_MENU)
     
-    choice = input("\nSelect option (1/2/3) [default: 1]: ").strip() or "1"
+    choice = ask("\nSelect option (1/2/3) [default: 1]: ", "1")
     
     openai_key = None
     hf_key = None
     
     if choice == "2":
-        openai_key = input("Enter OpenAI API key: ").strip()
+        openai_key = ask("Enter OpenAI API key: ")
         if not openai_key:
             print("⚠️ No OpenAI key provided, falling back to local summarization")
     elif choice == "3":
-        hf_key = input("Enter Hugging Face API key: ").strip()
+        hf_key = ask("Enter Hugging Face API key: ")
         if not hf_key:
             print("⚠️ No HF key provided, falling back to local summarization")
     
@@ -88,18 +144,15 @@ def get_api_setup():
 
 def get_execution_mode():
     """Get execution mode from user"""
-    print("\n⚙️ EXECUTION MODE:")
-    print("1. Quick run (5-10 minutes, get latest news)")
-    print("2. Complete run (15-20 minutes, comprehensive)")
-    print("3. Scheduled operation (run automatically)")
-    print("4. Interactive mode (full control)")
+    sys.stdout.write(EXECUTION_MODE_MENU)
     
-    mode = input("\nSelect mode (1/2/3/4) [default: 1]: ").strip() or "1"
+    mode = ask("\nSelect mode (1/2/3/4) [default: 1]: ", "1")
     return mode
 
 def run_quick_mode(agent):
     """Run quick mode - faster, fewer articles"""
     print("\n🚀 Starting Quick News Scan...")
+    run_stamp = datetime.now().strftime('%Y%m%d_%H%M')
     print("⚡ This will take 5-10 minutes")
     
     # Configure for speed
@@ -121,16 +174,19 @@ def run_quick_mode(agent):
         
         # Show top headlines
         print(f"\n📰 Top Headlines:")
-        count = 0
-        for source_results in [results['livemint'], results['moneycontrol'], results['additional_sources']]:
-            for article in source_results[:2]:
-                if count >= 5:
-                    break
-                print(f"   • {article['title'][:65]}...")
-                count += 1
+        seen_titles = set()
+        candidates = chain(
+            results['livemint'][:2],
+            results['moneycontrol'][:2],
+            results['additional_sources'][:2]
+        )
+        unique = (a for a in candidates
+                  if a['title'] not in seen_titles and not seen_titles.add(a['title']))
+        for article in islice(unique, 5):
+            print(f"   • {article['title'][:65]}...")
         
         # Quick export
-        export_file = agent.export_to_json(hours=1, filename=f"quick_news_{datetime.now().strftime('%Y%m%d_%H%M')}.json")
+        export_file = agent.export_to_json(hours=1, filename=f"quick_news_{run_stamp}.json")
         print(f"\n💾 Exported to: {export_file}")
     
     return results
@@ -138,6 +194,8 @@ def run_quick_mode(agent):
 def run_complete_mode(agent):
     """Run complete mode - comprehensive, more articles"""
     print("\n🚀 Starting Complete News Analysis...")
+    # Shared suffix so the report and its export pair up
+    run_stamp = datetime.now().strftime('%Y%m%d_%H%M')
     print("🔍 This will take 15-20 minutes for comprehensive coverage")
     
     results = agent.run_complete_scraping_cycle()
@@ -153,13 +211,13 @@ def run_complete_mode(agent):
         report = agent.generate_comprehensive_report()
         
         # Save report
-        report_file = f"complete_report_{datetime.now().strftime('%Y%m%d_%H%M')}.txt"
+        report_file = f"complete_report_{run_stamp}.txt"
         with open(report_file, 'w', encoding='utf-8') as f:
             f.write(report)
         print(f"✅ Report saved: {report_file}")
         
         # Export data
-        export_file = agent.export_to_json(filename=f"complete_export_{datetime.now().strftime('%Y%m%d_%H%M')}.json")
+        export_file = agent.export_to_json(filename=f"complete_export_{run_stamp}.json")
         print(f"✅ Data exported: {export_file}")
         
         # Show trending topics
@@ -176,30 +234,29 @@ def run_complete_mode(agent):
         print(f"   📊 Additional Sources: {len(results['additional_sources'])} articles")
         
         if results['additional_sources']:
-            sources = {}
-            for article in results['additional_sources']:
-                source = article['source']
-                sources[source] = sources.get(source, 0) + 1
-            print(f"       Additional breakdown: {', '.join([f'{k}({v})' for k, v in sources.items()])}")
+            sources = Counter(article['source'] for article in results['additional_sources'])
+            print(f"       Additional breakdown: {', '.join(f'{k}({v})' for k, v in sources.most_common())}")
     
     return results
 
-def run_scheduled_mode(agent):
+def run_scheduled_mode(agent, hours=None, max_runs=None):
     """Run scheduled mode"""
     print("\n📅 Setting up Scheduled Operation...")
     
-    # Get schedule preferences
-    hours = input("⏰ Run every X hours [default: 2]: ").strip()
-    try:
-        hours = int(hours) if hours else 2
-    except ValueError:
-        hours = 2
+    # Get schedule preferences (CLI values take precedence over prompts)
+    if hours is None:
+        hours = ask("⏰ Run every X hours [default: 2]: ")
+        try:
+            hours = int(hours) if hours else 2
+        except ValueError:
+            hours = 2
     
-    max_runs = input("🔢 Maximum runs (leave empty for unlimited): ").strip()
-    try:
-        max_runs = int(max_runs) if max_runs else None
-    except ValueError:
-        max_runs = None
+    if max_runs is None:
+        max_runs = ask("🔢 Maximum runs (leave empty for unlimited): ")
+        try:
+            max_runs = int(max_runs) if max_runs else None
+        except ValueError:
+            max_runs = None
     
     print(f"\n🚀 Running initial cycle...")
     initial_results = agent.run_complete_scraping_cycle()
@@ -215,15 +272,19 @@ def run_scheduled_mode(agent):
         print(f"🔢 Maximum {max_runs} runs")
     print(f"🛑 Press Ctrl+C to stop")
     
-    scheduler.start_scheduler(interval_hours=hours, max_runs=max_runs)
+    try:
+        scheduler.run_forever(interval_hours=hours, max_runs=max_runs)
+    except KeyboardInterrupt:
+        print(f"\n🛑 Scheduler stopped by user after {scheduler.run_count} runs")
 
-def main():
+def main(argv=None):
     """Main execution function"""
+    args = parse_args(argv)
     print_banner()
     
     # Check dependencies
     if not check_dependencies():
-        input("\nPress Enter to exit...")
+        ask("\nPress Enter to exit...")
         return
     
     # Download NLTK data
@@ -233,18 +294,22 @@ def main():
     env_openai = os.getenv('OPENAI_API_KEY')
     env_hf = os.getenv('HUGGINGFACE_API_KEY')
     
-    if env_openai or env_hf:
+    if args.openai_key or args.hf_key:
+        openai_key, hf_key = args.openai_key, args.hf_key
+    elif env_openai or env_hf:
         print("\n🔑 Found API keys in environment variables")
-        use_env = input("Use existing environment API keys? (Y/n): ").lower().strip()
+        use_env = ask("Use existing environment API keys? (Y/n): ", "y").lower()
         if use_env != 'n':
             openai_key, hf_key = env_openai, env_hf
         else:
             openai_key, hf_key = get_api_setup()
+    elif not is_interactive():
+        openai_key, hf_key = None, None
     else:
         openai_key, hf_key = get_api_setup()
     
     # Get execution mode
-    mode = get_execution_mode()
+    mode = MODE_CHOICES[args.mode] if args.mode else get_execution_mode()
     
     # Initialize agent
     print(f"\n🤖 Initializing News Agent...")
@@ -279,11 +344,11 @@ def main():
     except ImportError:
         print("❌ Error: integrated_news_agent.py not found in current directory")
         print("   Make sure both files are in the same folder")
-        input("Press Enter to exit...")
+        ask("Press Enter to exit...")
         return
     except Exception as e:
         print(f"❌ Failed to initialize agent: {e}")
-        input("Press Enter to exit...")
+        ask("Press Enter to exit...")
         return
     
     try:
@@ -293,7 +358,7 @@ def main():
         elif mode == "2":
             results = run_complete_mode(agent)
         elif mode == "3":
-            run_scheduled_mode(agent)
+            run_scheduled_mode(agent, hours=args.hours, max_runs=args.max_runs)
         elif mode == "4":
             # Interactive mode - import and run the main function
             from integrated_news_agent import main as interactive_main
@@ -308,7 +373,7 @@ def main():
             
             # Offer to run again
             if mode == "1":
-                again = input("\n🔄 Run another quick scan? (y/N): ").lower().strip()
+                again = ask("\n🔄 Run another quick scan? (y/N): ").lower()
                 if again == 'y':
                     run_quick_mode(agent)
     
@@ -325,7 +390,7 @@ def main():
         except:
             pass
         print(f"\n👋 Thanks for using the Integrated News Agent!")
-        input("Press Enter to exit...")
+        ask("Press Enter to exit...")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -105,19 +105,18 @@ def install_requirements_venv():
     """Install requirements in virtual environment"""
     print("\n📥 Installing requirements in virtual environment...")
     
-    # Try different pip paths
-    pip_commands = [
-        "venv\\Scripts\\pip",
-        "venv\\Scripts\\pip.exe",
-        "venv\\bin\\pip"
+    # Try different pip paths (first existing one wins)
+    pip_candidates = [
+        Path("venv/Scripts/pip.exe"),
+        Path("venv/Scripts/pip"),
+        Path("venv/bin/pip")
     ]
     
-    for pip_cmd in pip_commands:
-        if os.path.exists(pip_cmd) or os.path.exists(pip_cmd + ".exe"):
-            print(f"   Using {pip_cmd}")
-            break
+    pip_cmd = next((str(p) for p in pip_candidates if p.exists()), None)
+    if pip_cmd:
+        print(f"   Using {pip_cmd}")
     else:
-        pip_cmd = "venv\\Scripts\\pip"  # Default
+        pip_cmd = str(pip_candidates[0])  # Default
     
     # Upgrade pip
     success, output = run_command(f"{pip_cmd} install --upgrade pip")
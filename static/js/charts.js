@@ -0,0 +1,101 @@
+// Chart definitions. They are drawn on the page, or, for very large
+// payloads where canvases can be handed to a worker (OffscreenCanvas),
+// by this same file running as the chart worker
+
+// Same Chart.js build as the page loads
+const CHART_JS_URL = 'https://cdn.jsdelivr.net/npm/chart.js';
+
+// URL of this file, so the page can start it as the chart worker
+const CHARTS_SCRIPT_URL = typeof document !== 'undefined' && document.currentScript
+    ? document.currentScript.src : null;
+
+function createCharts(sourcesCanvas, trendCanvas, devicePixelRatio) {
+    // Sources pie chart
+    const sources = new Chart(sourcesCanvas, {
+        type: 'doughnut',
+        data: {
+            labels: [],
+            datasets: [{
+                data: [],
+                backgroundColor: [
+                    '#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF', '#FF9F40'
+                ]
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            animation: false,
+            devicePixelRatio: devicePixelRatio,
+            plugins: {
+                legend: {
+                    position: 'bottom'
+                }
+            }
+        }
+    });
+
+    // Daily trend line chart
+    const trend = new Chart(trendCanvas, {
+        type: 'line',
+        data: {
+            labels: [],
+            datasets: [{
+                label: 'Articles per Day',
+                data: [],
+                borderColor: '#667eea',
+                backgroundColor: 'rgba(102, 126, 234, 0.1)',
+                tension: 0.1
+            }]
+        },
+        options: {
+            responsive: true,
+            maintainAspectRatio: false,
+            animation: false,
+            devicePixelRatio: devicePixelRatio,
+            normalized: true,
+            spanGaps: true,
+            scales: {
+                y: {
+                    beginAtZero: true
+                }
+            }
+        }
+    });
+
+    return {sources: sources, trend: trend};
+}
+
+// Copy a statistics payload into the charts (counts go in typed arrays,
+// one allocation per series); returns the charts that need redrawing
+function setChartData(charts, data) {
+    const changed = [];
+    if (data.source_distribution) {
+        charts.sources.data.labels = data.source_distribution.map(s => s.source.replace('_', ' ').toUpperCase());
+        charts.sources.data.datasets[0].data = Uint32Array.from(data.source_distribution, s => s.count);
+        changed.push(charts.sources);
+    }
+    
+    if (data.daily_trend) {
+        charts.trend.data.labels = data.daily_trend.map(d => d.date);
+        charts.trend.data.datasets[0].data = Uint32Array.from(data.daily_trend, d => d.count);
+        changed.push(charts.trend);
+    }
+    return changed;
+}
+
+// Worker side: draw on the canvases transferred from the page
+if (typeof WorkerGlobalScope !== 'undefined' && self instanceof WorkerGlobalScope) {
+    importScripts(CHART_JS_URL);
+    let charts = null;
+    self.onmessage = function(event) {
+        const message = event.data;
+        if (message.cmd === 'init') {
+            charts = createCharts(message.sources, message.trend, message.devicePixelRatio);
+        } else if (message.cmd === 'update') {
+            setChartData(charts, message.data).forEach(chart => chart.update('none'));
+        } else if (message.cmd === 'resize') {
+            charts[message.chart].resize(message.width, message.height);
+        }
+    };
+}
@@ -0,0 +1,716 @@
+// Global variables
+let socket = null;
+let charts = null;
+let chartWorker = null;
+let isSchedulerRunning = false;
+
+// Render batcher: charts scheduled within the same frame are
+// repainted once, without animation, in the next animation frame
+const pendingCharts = new Set();
+let chartFrame = null;
+function scheduleChartUpdate(chart) {
+    pendingCharts.add(chart);
+    if (chartFrame === null) {
+        chartFrame = requestAnimationFrame(function() {
+            pendingCharts.forEach(c => c.update('none'));
+            pendingCharts.clear();
+            chartFrame = null;
+        });
+    }
+}
+
+// Initialize dashboard
+document.addEventListener('DOMContentLoaded', function() {
+    initializeSocket();
+    loadDashboard();
+    watchArticlesSentinel();
+});
+
+// Status and statistics are pushed over Socket.IO when they change;
+// this slow poll is only a safety net for missed events. It is
+// skipped while the tab is hidden, and requestAnimationFrame holds
+// a due tick until the tab is painted again
+const FALLBACK_POLL_MS = 300000;
+function refreshTick() {
+    if (!document.hidden) {
+        loadDashboard();
+    }
+    setTimeout(() => requestAnimationFrame(refreshTick), FALLBACK_POLL_MS);
+}
+setTimeout(() => requestAnimationFrame(refreshTick), FALLBACK_POLL_MS);
+
+// Pushed updates that arrive while the tab is hidden are held (latest
+// one per kind) and rendered once it becomes visible again
+const hiddenRenders = new Map();
+function renderWhenVisible(kind, render) {
+    if (document.hidden) {
+        hiddenRenders.set(kind, render);
+    } else {
+        render();
+    }
+}
+document.addEventListener('visibilitychange', function() {
+    if (!document.hidden) {
+        hiddenRenders.forEach(render => render());
+        hiddenRenders.clear();
+    }
+});
+
+// Socket.IO connection
+function initializeSocket() {
+    socket = io();
+    
+    socket.on('connect', function() {
+        addLog('Connected to News Agent server');
+        updateStatus('Connected', 'online');
+    });
+    
+    socket.on('disconnect', function() {
+        addLog('Disconnected from server');
+        updateStatus('Disconnected', 'offline');
+    });
+    
+    socket.on('scraping_started', function(data) {
+        addLog('Scraping cycle started...');
+        updateStatus('Scraping', 'running');
+        document.getElementById('scrape-btn').disabled = true;
+    });
+    
+    socket.on('scraping_completed', function(data) {
+        addLog(`Scraping completed: ${data.results.total_new_articles} articles found`);
+        updateStatus('Online', 'online');
+        document.getElementById('scrape-btn').disabled = false;
+        
+        // Statistics arrive separately as a stats_update push
+        refreshArticles();
+    });
+    
+    // Agent log lines are pushed as they are written
+    socket.on('log_line', data => addLog(data.message));
+    
+    socket.on('status_update', data => renderWhenVisible('status', () => renderStatus(data)));
+    socket.on('stats_update', data => renderWhenVisible('stats', () => renderStatistics(data)));
+    
+    socket.on('scraping_error', function(data) {
+        addLog(`Scraping error: ${data.error}`);
+        updateStatus('Error', 'offline');
+        document.getElementById('scrape-btn').disabled = false;
+    });
+}
+
+// Charts are created for the first statistics payload, on the page so
+// tooltips and legend toggling work. Only a payload big enough to stall
+// the page moves them to a worker (OffscreenCanvas), which gets no
+// pointer events
+const CHART_WORKER_MIN_POINTS = 5000;
+function initializeCharts(data) {
+    const sourcesCanvas = document.getElementById('sourcesChart');
+    const trendCanvas = document.getElementById('trendChart');
+    const points = (data.source_distribution || []).length + (data.daily_trend || []).length;
+    if (points >= CHART_WORKER_MIN_POINTS && CHARTS_SCRIPT_URL && window.Worker &&
+            'transferControlToOffscreen' in HTMLCanvasElement.prototype) {
+        startChartWorker({sources: sourcesCanvas, trend: trendCanvas});
+    } else {
+        charts = createCharts(sourcesCanvas, trendCanvas, window.devicePixelRatio);
+    }
+}
+
+function startChartWorker(canvases) {
+    // The worker cannot see the layout, so the page keeps each canvas
+    // at its container's width (and its original height) and passes
+    // the size on
+    const heights = {sources: canvases.sources.height, trend: canvases.trend.height};
+    const offscreen = {
+        sources: canvases.sources.transferControlToOffscreen(),
+        trend: canvases.trend.transferControlToOffscreen()
+    };
+    chartWorker = new Worker(CHARTS_SCRIPT_URL);
+    chartWorker.onerror = event => console.error('Chart worker error:', event.message);
+    chartWorker.postMessage({
+        cmd: 'init',
+        sources: offscreen.sources,
+        trend: offscreen.trend,
+        devicePixelRatio: window.devicePixelRatio
+    }, [offscreen.sources, offscreen.trend]);
+    
+    Object.keys(canvases).forEach(function(name) {
+        const canvas = canvases[name];
+        new ResizeObserver(function(entries) {
+            const width = Math.floor(entries[0].contentRect.width);
+            canvas.style.width = `${width}px`;
+            canvas.style.height = `${heights[name]}px`;
+            chartWorker.postMessage({cmd: 'resize', chart: name, width: width, height: heights[name]});
+        }).observe(canvas.parentElement);
+    });
+}
+
+// Update status indicator
+function updateStatus(text, status) {
+    document.getElementById('status-text').textContent = text;
+    const indicator = document.getElementById('status-indicator');
+    indicator.className = `status-indicator status-${status}`;
+    document.getElementById('last-update').textContent = new Date().toLocaleTimeString();
+}
+
+// Add log entry
+function addLog(message) {
+    const container = document.getElementById('logs-container');
+    const timestamp = new Date().toLocaleTimeString();
+    const logEntry = document.createElement('div');
+    logEntry.textContent = `[${timestamp}] ${message}`;
+    container.appendChild(logEntry);
+    container.scrollTop = container.scrollHeight;
+}
+
+// Ask for values in the form dialog instead of blocking on prompt().
+// Resolves with {name: value} when submitted, or null when dismissed
+function askForm({title, fields = [], message = '', submitLabel = 'OK', danger = false}) {
+    const modalEl = document.getElementById('form-modal');
+    const form = document.getElementById('form-modal-form');
+    const body = document.getElementById('form-modal-body');
+    const submit = document.getElementById('form-modal-submit');
+    document.getElementById('form-modal-title').textContent = title;
+    submit.textContent = submitLabel;
+    submit.className = danger ? 'btn btn-danger' : 'btn btn-primary';
+    
+    body.replaceChildren();
+    if (message) {
+        const text = document.createElement('p');
+        text.textContent = message;
+        body.appendChild(text);
+    }
+    const inputs = fields.map(function(field) {
+        const group = document.createElement('div');
+        group.className = 'mb-3';
+        const label = document.createElement('label');
+        label.className = 'form-label';
+        label.htmlFor = `form-modal-${field.name}`;
+        label.textContent = field.label;
+        const input = document.createElement('input');
+        input.className = 'form-control';
+        input.id = `form-modal-${field.name}`;
+        input.name = field.name;
+        input.type = field.type || 'text';
+        input.autocomplete = 'off';
+        if (field.value !== undefined) {
+            input.value = field.value;
+        }
+        if (field.min !== undefined) {
+            input.min = field.min;
+        }
+        group.append(label, input);
+        body.appendChild(group);
+        return input;
+    });
+    
+    const modal = bootstrap.Modal.getOrCreateInstance(modalEl);
+    return new Promise(function(resolve) {
+        // Resolved from the submit handler itself, so callers still run
+        // within the user gesture (needed by showSaveFilePicker)
+        form.onsubmit = function(event) {
+            event.preventDefault();
+            resolve(Object.fromEntries(new FormData(form)));
+            modal.hide();
+        };
+        modalEl.addEventListener('hidden.bs.modal', () => resolve(null), {once: true});
+        if (inputs.length) {
+            modalEl.addEventListener('shown.bs.modal', () => inputs[0].focus(), {once: true});
+        }
+        modal.show();
+    });
+}
+
+// API functions
+// Load status and statistics with one request
+async function loadDashboard() {
+    try {
+        const response = await fetch('/api/dashboard');
+        const data = await response.json();
+        
+        renderStatus(data.status);
+        if (data.status.agent_initialized) {
+            addLog('Agent is initialized and ready');
+        }
+        if (data.statistics) {
+            renderStatistics(data.statistics);
+        }
+    
+    } catch (error) {
+        console.error('Error loading dashboard:', error);
+        updateStatus('Error', 'offline');
+    }
+}
+
+// Render a status payload (from /api/dashboard or a status_update push)
+function renderStatus(data) {
+    if (data.is_running) {
+        updateStatus('Scraping', 'running');
+    } else if (data.agent_initialized) {
+        updateStatus('Online', 'online');
+    } else {
+        updateStatus('Agent Not Initialized', 'offline');
+    }
+    document.getElementById('scrape-btn').disabled = data.is_running;
+    
+    if (data.stats.last_run) {
+        document.getElementById('processing-time').textContent = 
+            data.stats.processing_time ? `${data.stats.processing_time.toFixed(1)}s` : '0s';
+    }
+}
+
+// Render a statistics payload (from /api/dashboard or a stats_update push)
+function renderStatistics(data) {
+    // Update metric cards
+    document.getElementById('total-articles').textContent = data.total_articles || 0;
+    document.getElementById('recent-articles').textContent = data.recent_articles || 0;
+    
+    // Update charts
+    if (!charts && !chartWorker) {
+        initializeCharts(data);
+    }
+    if (chartWorker) {
+        chartWorker.postMessage({
+            cmd: 'update',
+            data: {source_distribution: data.source_distribution, daily_trend: data.daily_trend}
+        });
+    } else {
+        setChartData(charts, data).forEach(scheduleChartUpdate);
+    }
+}
+
+async function initializeAgent() {
+    const values = await askForm({
+        title: 'Initialize Agent',
+        fields: [
+            {name: 'openai_api_key', label: 'OpenAI API Key (optional, leave empty for local summarization)', type: 'password'},
+            {name: 'huggingface_api_key', label: 'Hugging Face API Key (optional)', type: 'password'}
+        ],
+        submitLabel: 'Initialize'
+    });
+    if (!values) {
+        return;
+    }
+    const openaiKey = values.openai_api_key;
+    const hfKey = values.huggingface_api_key;
+    
+    try {
+        const response = await fetch('/api/initialize', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                openai_api_key: openaiKey || undefined,
+                huggingface_api_key: hfKey || undefined,
+                max_articles_per_page: 5,
+                enable_logging: true
+            })
+        });
+        
+        const data = await response.json();
+        
+        if (data.success) {
+            addLog('Agent initialized successfully');
+            updateStatus('Online', 'online');
+            document.getElementById('summarization-method').textContent = 
+                data.summarization_method || 'Local';
+        } else {
+            addLog(`Initialization failed: ${data.error}`);
+            alert(`Error: ${data.error}`);
+        }
+        
+    } catch (error) {
+        console.error('Error initializing agent:', error);
+        addLog(`Initialization error: ${error.message}`);
+    }
+}
+
+async function startScraping() {
+    try {
+        const response = await fetch('/api/scrape', {
+            method: 'POST'
+        });
+        
+        const data = await response.json();
+        
+        if (!data.success) {
+            alert(`Error: ${data.error}`);
+        }
+        
+    } catch (error) {
+        console.error('Error starting scraping:', error);
+        addLog(`Scraping error: ${error.message}`);
+    }
+}
+
+async function toggleScheduler() {
+    const action = isSchedulerRunning ? 'stop' : 'start';
+    let intervalHours = 2;
+    
+    if (action === 'start') {
+        const values = await askForm({
+            title: 'Start Scheduler',
+            fields: [{name: 'hours', label: 'Run every X hours', type: 'number', value: 2, min: 1}],
+            submitLabel: 'Start'
+        });
+        if (!values) {
+            return;
+        }
+        intervalHours = parseInt(values.hours) || 2;
+    }
+    
+    try {
+        const response = await fetch('/api/schedule', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                action: action,
+                interval_hours: intervalHours
+            })
+        });
+        
+        const data = await response.json();
+        
+        if (data.success) {
+            isSchedulerRunning = !isSchedulerRunning;
+            const btn = document.getElementById('schedule-btn');
+            btn.innerHTML = isSchedulerRunning ? 
+                '<i class="fas fa-stop"></i> Stop Scheduler' : 
+                '<i class="fas fa-clock"></i> Start Scheduler';
+            btn.className = isSchedulerRunning ? 'btn btn-danger w-100 mb-2' : 'btn btn-warning w-100 mb-2';
+            addLog(data.message);
+        } else {
+            alert(`Error: ${data.error}`);
+        }
+        
+    } catch (error) {
+        console.error('Error with scheduler:', error);
+        addLog(`Scheduler error: ${error.message}`);
+    }
+}
+
+// Swap a container's children for server-rendered markup. The markup
+// is parsed in an inert <template>, off the live document, and the
+// result is inserted with a single replaceChildren()
+function replaceWithHtml(container, html) {
+    const template = document.createElement('template');
+    template.innerHTML = html;
+    container.replaceChildren(template.content);
+}
+
+// Each card in /api/articles.html ends with this marker, so cards can
+// be inserted as the response streams in rather than after it ends
+const CARD_DELIMITER = '<!--/card-->';
+
+async function streamCardsInto(container, response) {
+    if (!response.body || !window.TextDecoderStream) {
+        replaceWithHtml(container, await response.text());
+        return;
+    }
+    
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    const parser = document.createElement('template');
+    let buffer = '';
+    let cleared = false;
+    while (true) {
+        const {value, done} = await reader.read();
+        if (!done) {
+            buffer += value;
+        }
+        
+        // Parse every complete card received so far (or whatever is
+        // left at the end) off-document, then insert it in one go
+        const last = buffer.lastIndexOf(CARD_DELIMITER);
+        const end = done ? buffer.length : last === -1 ? 0 : last + CARD_DELIMITER.length;
+        if (end > 0 || done) {
+            parser.innerHTML = buffer.slice(0, end);
+            buffer = buffer.slice(end);
+            if (!cleared) {
+                container.replaceChildren();
+                cleared = true;
+            }
+            container.appendChild(parser.content);
+        }
+        if (done) {
+            break;
+        }
+    }
+}
+
+// Update a list of keyed cards in place: unchanged cards (same key and
+// identical markup) are kept, changed ones are swapped, new ones are
+// inserted and missing ones removed, so a refresh touches only the
+// delta and keeps scroll position
+function reconcileKeyed(container, html, key) {
+    const template = document.createElement('template');
+    template.innerHTML = html;
+    const incoming = Array.from(template.content.children);
+    if (!incoming.length || !incoming.every(node => node.dataset[key])) {
+        container.replaceChildren(template.content);
+        return;
+    }
+    
+    const existing = new Map();
+    for (const el of container.children) {
+        if (el.dataset[key]) {
+            existing.set(el.dataset[key], el);
+        }
+    }
+    const ordered = incoming.map(node => {
+        const current = existing.get(node.dataset[key]);
+        return current && current.isEqualNode(node) ? current : node;
+    });
+    
+    const keep = new Set(ordered);
+    for (const el of Array.from(container.children)) {
+        if (!keep.has(el)) {
+            el.remove();
+        }
+    }
+    ordered.forEach((el, i) => {
+        const at = container.children[i] || null;
+        if (at !== el) {
+            container.insertBefore(el, at);
+        }
+    });
+}
+
+// Append cards whose key is not already in the container
+function appendKeyed(container, html, key) {
+    const template = document.createElement('template');
+    template.innerHTML = html;
+    const present = new Set(Array.from(container.children, el => el.dataset[key]));
+    for (const node of Array.from(template.content.children)) {
+        if (present.has(node.dataset[key])) {
+            node.remove();
+        }
+    }
+    container.appendChild(template.content);
+}
+
+// Articles are loaded a page at a time: the server returns the cursor
+// of the next page, which is fetched when the sentinel below the list
+// scrolls into view
+let articlesCursor = null;
+let loadingMoreArticles = false;
+const articlesObserver = new IntersectionObserver(function(entries) {
+    if (entries[0].isIntersecting) {
+        loadMoreArticles();
+    }
+}, {rootMargin: '200px'});
+
+function watchArticlesSentinel() {
+    // Observing again re-checks visibility, so a page too short to
+    // push the sentinel out of view still leads to the next one
+    const sentinel = document.getElementById('articles-sentinel');
+    articlesObserver.unobserve(sentinel);
+    articlesObserver.observe(sentinel);
+}
+
+async function loadMoreArticles() {
+    const cursor = articlesCursor;
+    if (!cursor || loadingMoreArticles) {
+        return;
+    }
+    
+    loadingMoreArticles = true;
+    try {
+        const response = await fetch(`/api/articles.html?hours=24&after=${encodeURIComponent(cursor)}`);
+        // Drop the page if a refresh started the list over meanwhile
+        if (!response.ok || cursor !== articlesCursor) {
+            return;
+        }
+        appendKeyed(document.getElementById('articles-container'), await response.text(), 'id');
+        articlesCursor = response.headers.get('X-Next-Cursor') || null;
+        watchArticlesSentinel();
+    
+    } catch (error) {
+        console.error('Error loading more articles:', error);
+    } finally {
+        loadingMoreArticles = false;
+    }
+}
+
+// Error message from a failed request's JSON body (or its status)
+async function responseError(response) {
+    try {
+        return (await response.json()).error || response.statusText;
+    } catch (error) {
+        return response.statusText || `HTTP ${response.status}`;
+    }
+}
+
+async function refreshArticles() {
+    try {
+        // Cards are rendered (and cached) on the server. The first
+        // load streams them in; later refreshes only apply the changes
+        // (and go back to the first page)
+        const container = document.getElementById('articles-container');
+        const response = await fetch('/api/articles.html?hours=24');
+        if (!response.ok) {
+            addLog(`Error loading articles: ${await responseError(response)}`);
+            return;
+        }
+        articlesCursor = response.headers.get('X-Next-Cursor') || null;
+        if (container.querySelector('[data-id]')) {
+            reconcileKeyed(container, await response.text(), 'id');
+        } else {
+            await streamCardsInto(container, response);
+        }
+        watchArticlesSentinel();
+    
+    } catch (error) {
+        console.error('Error loading articles:', error);
+        addLog(`Error loading articles: ${error.message}`);
+    }
+}
+
+async function refreshTrending() {
+    try {
+        const response = await fetch('/api/trending.html?hours=24&limit=15');
+        if (!response.ok) {
+            addLog(`Error loading trending: ${await responseError(response)}`);
+            return;
+        }
+        replaceWithHtml(document.getElementById('trending-container'), await response.text());
+    
+    } catch (error) {
+        console.error('Error loading trending topics:', error);
+        addLog(`Error loading trending: ${error.message}`);
+    }
+}
+
+async function generateReport() {
+    const values = await askForm({
+        title: 'Generate Report',
+        fields: [{name: 'hours', label: 'Generate report for last X hours', type: 'number', value: 24, min: 1}],
+        submitLabel: 'Generate'
+    });
+    if (!values) {
+        return;
+    }
+    const hoursNum = parseInt(values.hours) || 24;
+    
+    try {
+        const response = await fetch(`/api/report?hours=${hoursNum}`);
+        const data = await response.json();
+        
+        if (data.report) {
+            // Show the report in a new window. It contains scraped titles
+            // and summaries, so it is set as text rather than written as HTML
+            const reportWindow = window.open('', '_blank');
+            if (!reportWindow) {
+                addLog('Report window was blocked by the browser');
+                return;
+            }
+            const reportDoc = reportWindow.document;
+            reportDoc.title = 'News Report';
+            reportDoc.body.style.cssText = 'font-family: monospace; white-space: pre-wrap; padding: 20px;';
+            reportDoc.body.textContent = data.report;
+            addLog(`Report generated for last ${hoursNum} hours`);
+        } else {
+            alert(`Error: ${data.error}`);
+        }
+        
+    } catch (error) {
+        console.error('Error generating report:', error);
+        addLog(`Report error: ${error.message}`);
+    }
+}
+
+async function exportData() {
+    const values = await askForm({
+        title: 'Export Data',
+        fields: [{name: 'hours', label: 'Export data from last X hours', type: 'number', value: 24, min: 1}],
+        submitLabel: 'Export'
+    });
+    if (!values) {
+        return;
+    }
+    const hoursNum = parseInt(values.hours) || 24;
+    
+    const filename = `news_export_${new Date().toISOString().slice(0,10)}.ndjson`;
+    
+    try {
+        // Where supported, pick the file first (while the click still
+        // counts as a user gesture) and stream the export straight to
+        // disk; otherwise fall back to a Blob download
+        let fileHandle = null;
+        if (window.showSaveFilePicker) {
+            try {
+                fileHandle = await window.showSaveFilePicker({suggestedName: filename});
+            } catch (error) {
+                if (error.name === 'AbortError') {
+                    return;
+                }
+            }
+        }
+        
+        const response = await fetch(`/api/export?hours=${hoursNum}&format=ndjson`);
+        
+        if (response.ok) {
+            if (fileHandle) {
+                await response.body.pipeTo(await fileHandle.createWritable());
+            } else {
+                const blob = await response.blob();
+                const url = window.URL.createObjectURL(blob);
+                const a = document.createElement('a');
+                a.style.display = 'none';
+                a.href = url;
+                a.download = filename;
+                document.body.appendChild(a);
+                a.click();
+                window.URL.revokeObjectURL(url);
+            }
+            addLog(`Data exported for last ${hoursNum} hours`);
+        } else {
+            const error = await response.json();
+            alert(`Export error: ${error.error}`);
+        }
+        
+    } catch (error) {
+        console.error('Error exporting data:', error);
+        addLog(`Export error: ${error.message}`);
+    }
+}
+
+async function cleanupData() {
+    const values = await askForm({
+        title: 'Cleanup Old Data',
+        message: 'Articles older than this are permanently deleted.',
+        fields: [{name: 'days', label: 'Delete articles older than X days', type: 'number', value: 30, min: 1}],
+        submitLabel: 'Delete',
+        danger: true
+    });
+    if (!values) {
+        return;
+    }
+    const daysNum = parseInt(values.days) || 30;
+    
+    try {
+        const response = await fetch('/api/cleanup', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                days: daysNum
+            })
+        });
+        
+        const data = await response.json();
+        
+        if (data.success) {
+            addLog(`Cleanup completed: ${data.deleted_count} articles deleted`);
+            loadDashboard();
+        } else {
+            alert(`Error: ${data.error}`);
+        }
+        
+    } catch (error) {
+        console.error('Error during cleanup:', error);
+        addLog(`Cleanup error: ${error.message}`);
+    }
+}
@@ -5,30 +5,217 @@ Flask-based web interface for monitoring and controlling the news agent
 """
 
 import os
+import gzip
 import json
+import hashlib
+import logging
+import mimetypes
+import queue
 import sqlite3
 import threading
 import time
-from datetime import datetime, timedelta
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 try:
-    from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, send_file
+    from flask import (Flask, Response, render_template, request, redirect, url_for, flash,
+                       send_from_directory, stream_with_context)
     from flask_socketio import SocketIO, emit
     FLASK_AVAILABLE = True
 except ImportError:
     FLASK_AVAILABLE = False
     print("⚠️ Flask not available. Install with: pip install flask flask-socketio")
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
 # Import our news agent
 try:
-    from integrated_news_agent import IntegratedNewsAgent, NewsConfig, EnhancedNewsScheduler
+    from integrated_news_agent import IntegratedNewsAgent, NewsConfig
     AGENT_AVAILABLE = True
 except ImportError:
     AGENT_AVAILABLE = False
     print("⚠️ integrated_news_agent.py not found")
 
+DB_PATH = 'news_agent.db'
+DB_POOL_SIZE = 8
+
+# Applied to every pooled connection when it is opened; pooled connections
+# only serve read endpoints, so they are also marked query_only
+DB_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-131072",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA query_only=1"
+]
+
+# How often (seconds) the WAL file is checkpointed and truncated
+WAL_CHECKPOINT_INTERVAL = 60
+
+# Days of history in the daily trend
+TREND_DAYS = 7
+
+# All statistics in one statement: rows are tagged 'total', 'dist' (24h
+# counts per category/source, lower-cardinality column first) or 'day'
+# (daily trend). Parameters: (recent_cutoff, trend_cutoff); the SQL text
+# never changes, so sqlite3's statement cache reuses the prepared plan
+_STATISTICS_SQL = """
+    SELECT 'total', NULL, NULL, v FROM stats_meta WHERE k = 'articles_total'
+    UNION ALL
+    SELECT 'dist', category, source, COUNT(*)
+    FROM articles
+    WHERE scraped_at > ?
+    GROUP BY category, source
+    UNION ALL
+    SELECT 'day', date, NULL, SUM(count)
+    FROM daily_stats
+    WHERE date >= ?
+    GROUP BY date
+    ORDER BY 1, 2
+"""
+
+# For databases created before the stats_meta/daily_stats tables existed
+_STATISTICS_FALLBACK_SQL = """
+    SELECT 'total', NULL, NULL, COUNT(*) FROM articles
+    UNION ALL
+    SELECT 'dist', category, source, COUNT(*)
+    FROM articles
+    WHERE scraped_at > ?
+    GROUP BY category, source
+    UNION ALL
+    SELECT 'day', DATE(scraped_at), NULL, COUNT(*)
+    FROM articles
+    WHERE scraped_at > ?
+    GROUP BY DATE(scraped_at)
+    ORDER BY 1, 2
+"""
+
+# Shared message bus for SocketIO when running more than one server process,
+# e.g. redis://localhost:6379/0 (requires: pip install redis)
+SOCKETIO_MESSAGE_QUEUE = os.getenv('SOCKETIO_MESSAGE_QUEUE')
+
+# Response cache timings (seconds): fresh for CACHE_TTL, then served stale
+# while a background refresh runs until STATS_STALE_TTL
+CACHE_TTL = 30
+STATS_STALE_TTL = 90
+
+# Most entries kept in the response cache (least recently used go first);
+# keys include query parameters such as hours and page cursors
+CACHE_MAX_ENTRIES = 128
+
+# Statistics only change when the database does (which drops the cache) or
+# as the 24h window moves, so they are kept until the current bucket of
+# this many seconds ends rather than for CACHE_TTL
+STATS_BUCKET_SECONDS = 300
+
+# Reports are only regenerated when the data changes or after this long
+REPORT_CACHE_TTL = 300
+
+# Page size for /api/articles
+ARTICLES_PAGE_SIZE = 50
+ARTICLES_MAX_PAGE_SIZE = 500
+
+# Cards per page of /api/articles.html; the dashboard loads the next page
+# as the list is scrolled
+ARTICLE_CARDS_PAGE_SIZE = 20
+
+# How often (seconds) the status is checked for changes that did not come
+# through a handler; status_update is only emitted when something changed
+STATUS_PUSH_INTERVAL = 5
+
+# Browser caching for polled GET endpoints
+HTTP_CACHE_CONTROL = 'max-age=15, stale-while-revalidate=60'
+
+# Browser caching (seconds) for the static dashboard page
+DASHBOARD_MAX_AGE = 3600
+
+# Response compression (used when flask-compress is installed); bodies
+# smaller than COMPRESS_MIN_SIZE bytes are sent as-is
+COMPRESS_MIMETYPES = ['application/json', 'application/x-ndjson', 'text/html']
+COMPRESS_ALGORITHMS = ['br', 'gzip']
+COMPRESS_MIN_SIZE = 512
+COMPRESS_LEVEL = 6
+COMPRESS_BR_LEVEL = 5
+
+# Files under static/ are served from /assets/ with a content hash in the
+# URL, so browsers may keep them for a year; .br/.gz copies are written
+# next to each file at startup at the highest compression level
+ASSET_MAX_AGE = 31536000
+ASSET_MANIFEST = '.precompressed.json'
+BROTLI_STATIC_QUALITY = 11
+GZIP_STATIC_LEVEL = 9
+
+# Cached API bodies are compressed once per ETag (and the result kept for
+# the COMPRESSED_CACHE_SIZE most recent ones) instead of on every response
+CACHED_BROTLI_QUALITY = 9
+CACHED_GZIP_LEVEL = 9
+COMPRESSED_CACHE_SIZE = 256
+
+def precompressors(brotli_quality: int = BROTLI_STATIC_QUALITY, gzip_level: int = GZIP_STATIC_LEVEL):
+    """(encoding, file suffix, compress function) for precompressed assets"""
+    encoders = []
+    if BROTLI_AVAILABLE:
+        encoders.append(('br', '.br', lambda data: brotli.compress(data, quality=brotli_quality)))
+    encoders.append(('gzip', '.gz', lambda data: gzip.compress(data, compresslevel=gzip_level, mtime=0)))
+    return encoders
+
+def dumps_json(data) -> bytes:
+    """Serialize to compact UTF-8 JSON, using orjson when available"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+
+def raise_open_file_limit(target: int = 65536):
+    """Raise the soft open-file limit so many WebSocket clients can connect"""
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return
+    
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard != resource.RLIM_INFINITY:
+        target = min(target, hard)
+    if soft == resource.RLIM_INFINITY or soft >= target:
+        return
+    try:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    except (ValueError, OSError) as e:
+        print(f"⚠️ Could not raise open file limit: {e}")
+
+class SocketIOLogHandler(logging.Handler):
+    """Logging handler that pushes agent log lines to clients as log_line events"""
+    
+    def __init__(self, socketio, level=logging.INFO):
+        super().__init__(level)
+        self.setFormatter(logging.Formatter('%(message)s'))
+        self._socketio = socketio
+    
+    def emit(self, record):
+        try:
+            self._socketio.emit('log_line', {'message': self.format(record)})
+        except Exception:
+            self.handleError(record)
+
 class NewsAgentWebInterface:
     """Web interface for the news agent"""
     
@@ -40,17 +227,565 @@ class NewsAgentWebInterface:
         
         self.app = Flask(__name__)
         self.app.secret_key = 'news_agent_secret_key_change_in_production'
-        self.socketio = SocketIO(self.app, cors_allowed_origins="*")
+        if COMPRESS_AVAILABLE:
+            self.app.config.update(
+                COMPRESS_MIMETYPES=COMPRESS_MIMETYPES,
+                COMPRESS_ALGORITHM=COMPRESS_ALGORITHMS,
+                COMPRESS_MIN_SIZE=COMPRESS_MIN_SIZE,
+                COMPRESS_LEVEL=COMPRESS_LEVEL,
+                COMPRESS_BR_LEVEL=COMPRESS_BR_LEVEL
+            )
+            Compress(self.app)
+        self.socketio = SocketIO(
+            self.app,
+            cors_allowed_origins="*",
+            message_queue=SOCKETIO_MESSAGE_QUEUE,
+            http_compression=True,
+            compression_threshold=COMPRESS_MIN_SIZE
+        )
         
         # Initialize agent
         self.agent = None
-        self.scheduler = None
-        self.is_running = False
         self.current_stats = {}
         
+        # Whether DB_PATH exists; once it does it is not checked again
+        self._db_exists: Optional[bool] = None
+        
+        # Whether the database has the stats_meta/daily_stats summary
+        # tables; once they exist this is not checked again
+        self._summary_tables = False
+        
+        # Background work (manual and scheduled scrapes) runs on one
+        # long-lived worker fed by a job queue; _state is only changed
+        # under _state_lock so concurrent requests cannot both start a run
+        self._job_queue = queue.Queue()
+        self._state_lock = threading.Lock()
+        self._state = 'idle'
+        self._schedule_interval = None
+        self._next_scheduled_run = None
+        self._worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self._worker.start()
+        
+        # Reusable SQLite connections for dashboard reads (opened lazily so
+        # the database file is not created before the agent runs)
+        self._pool = queue.Queue(maxsize=DB_POOL_SIZE)
+        self._pool_size = 0
+        self._pool_lock = threading.Lock()
+        
+        # Keep the WAL file from growing without bound between scrapes
+        self._checkpointer = threading.Thread(target=self._checkpoint_loop, daemon=True)
+        self._checkpointer.start()
+        
+        # Cached API payloads keyed by (endpoint, params), least recently
+        # used first; _data_version is bumped whenever scraping or cleanup
+        # changes the database
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._refreshing = set()
+        self._inflight = {}
+        self._data_version = 0
+        self._compressed = OrderedDict()
+        self._body_encoders = {
+            encoding: compress
+            for encoding, _, compress in precompressors(CACHED_BROTLI_QUALITY, CACHED_GZIP_LEVEL)
+        }
+        
+        # Content hashes and precompressed variants of static files, and
+        # the dashboard page rendered once with the versioned asset URLs.
+        # They are built on a background thread while the rest of the
+        # server starts; requests that need them wait for _assets_ready
+        self._asset_versions: Dict[str, str] = {}
+        self._asset_encodings: Dict[str, List[str]] = {}
+        self._dashboard_page: Dict[str, bytes] = {}
+        self._dashboard_etag = None
+        self._assets_ready = threading.Event()
+        threading.Thread(target=self._build_assets, daemon=True).start()
+        
+        # Agent log lines (INFO and up) go out over the existing Socket.IO
+        # connection (the agent keeps this handler when it is re-initialized
+        # and resets its own)
+        self._log_handler = SocketIOLogHandler(self.socketio)
+        logging.getLogger('NewsAgent').addHandler(self._log_handler)
+        
         # Setup routes
         self.setup_routes()
         self.setup_socketio_events()
+        
+        # Clients get status over SocketIO instead of polling /api/status
+        self._last_status = None
+        self._status_lock = threading.Lock()
+        self.socketio.start_background_task(self._status_push_loop)
+    
+    @property
+    def is_running(self) -> bool:
+        """Whether a scraping run is queued or in progress"""
+        return self._state == 'running'
+    
+    @property
+    def scheduler_active(self) -> bool:
+        """Whether scheduled scraping is enabled"""
+        return self._next_scheduled_run is not None
+    
+    def _try_start_run(self) -> bool:
+        """Atomically move from idle to running; False if already running"""
+        with self._state_lock:
+            if self._state != 'idle':
+                return False
+            self._state = 'running'
+            return True
+    
+    def _worker_loop(self):
+        """Process queued jobs and fire scheduled scrapes when they are due"""
+        while True:
+            with self._state_lock:
+                next_run = self._next_scheduled_run
+            timeout = None if next_run is None else max(0.0, next_run - time.time())
+            
+            try:
+                job, payload = self._job_queue.get(timeout=timeout)
+            except queue.Empty:
+                with self._state_lock:
+                    if self._next_scheduled_run is None:
+                        continue
+                    self._next_scheduled_run = time.time() + self._schedule_interval * 3600
+                # Skip this tick if a manual run is still going
+                if not self._try_start_run():
+                    continue
+                job, payload = 'scrape', {'scheduled': True}
+            
+            # 'schedule' jobs only wake the loop so it picks up the new timing
+            if job == 'scrape':
+                self._run_scraping()
+    
+    def _run_scraping(self):
+        """Run one scraping cycle; the caller must have claimed the running state"""
+        try:
+            # Emit start event
+            self.socketio.emit('scraping_started', {'message': 'Scraping started'})
+            self._push_status()
+            
+            # Run scraping
+            results = self.agent.run_complete_scraping_cycle()
+            
+            # Update stats
+            self.current_stats = {
+                'last_run': datetime.now().isoformat(),
+                'total_articles': results['total_new_articles'],
+                'processing_time': results['processing_time'],
+                'summarization_method': results['summarization_method']
+            }
+            
+            # Emit completion event. Clients only show counts, so the
+            # scraped articles and summaries are not broadcast to every tab
+            self.socketio.emit('scraping_completed', {
+                'results': {
+                    'total_new_articles': results['total_new_articles'],
+                    'processing_time': results['processing_time'],
+                    'timestamp': results['timestamp'],
+                    'source_counts': {
+                        source: len(results[source])
+                        for source in ('livemint', 'moneycontrol', 'additional_sources')
+                    },
+                    'stats': results['stats']
+                },
+                'stats': self.current_stats
+            })
+        
+        except Exception as e:
+            self.socketio.emit('scraping_error', {'error': str(e)})
+        finally:
+            with self._state_lock:
+                self._state = 'idle'
+            self._invalidate_caches()
+            self._push_status()
+            self._push_statistics()
+    
+    def _status_payload(self) -> Dict:
+        """Current agent/run state, as served by /api/status"""
+        return {
+            'agent_initialized': self.agent is not None,
+            'is_running': self.is_running,
+            'scheduler_active': self.scheduler_active,
+            'database_exists': self._database_exists(),
+            'stats': self.current_stats
+        }
+    
+    def _push_status(self):
+        """Emit status_update to all clients if the status has changed"""
+        with self._status_lock:
+            payload = self._status_payload()
+            if payload == self._last_status:
+                return
+            self._last_status = payload
+            self.socketio.emit('status_update', payload)
+    
+    def _status_push_loop(self):
+        """Catch status changes made outside the request handlers"""
+        while True:
+            self.socketio.sleep(STATUS_PUSH_INTERVAL)
+            self._push_status()
+    
+    def _push_statistics(self):
+        """Recompute statistics, refresh the cached copy and push stats_update"""
+        if not self._database_exists():
+            return
+        with self._cache_lock:
+            version = self._data_version
+        try:
+            stats = self._compute_statistics()
+        except Exception as e:
+            print(f"⚠️ Could not push statistics: {e}")
+            return
+        self._store_cached(('statistics',), self._body_entry(dumps_json(stats)), version,
+                           STATS_BUCKET_SECONDS + STATS_STALE_TTL)
+        self.socketio.emit('stats_update', stats)
+    
+    def _json(self, data, status: int = 200) -> Response:
+        """Build a JSON response (faster than jsonify for large payloads)"""
+        return Response(dumps_json(data), status=status, mimetype='application/json')
+    
+    def _not_modified(self, etag: str, weak: bool = False,
+                      cache_control: str = HTTP_CACHE_CONTROL) -> Optional[Response]:
+        """Return a 304 response if the client already has this ETag (or a compressed variant)"""
+        candidates = [etag] + [f"{etag}:{algorithm}" for algorithm in COMPRESS_ALGORITHMS]
+        if any(request.if_none_match.contains_weak(tag) for tag in candidates):
+            response = Response(status=304)
+            response.set_etag(etag, weak=weak)
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return None
+    
+    def _build_assets(self):
+        """Hash and precompress static files, then render the dashboard page"""
+        try:
+            static_root = Path(self.app.static_folder)
+            manifest_path = static_root / ASSET_MANIFEST
+            try:
+                built = json.loads(manifest_path.read_text())
+            except (OSError, ValueError):
+                built = {}
+            
+            encoders = precompressors()
+            suffixes = tuple(suffix for _, suffix, _ in encoders)
+            manifest = {}
+            for path in sorted(static_root.rglob('*')):
+                if not path.is_file() or path.name.endswith(suffixes) or path == manifest_path:
+                    continue
+                data = path.read_bytes()
+                rel = path.relative_to(static_root).as_posix()
+                version = hashlib.blake2b(data, digest_size=8).hexdigest()
+                self._asset_versions[rel] = version
+                self._asset_encodings[rel] = []
+                for encoding, suffix, compress in encoders:
+                    target = path.with_name(path.name + suffix)
+                    try:
+                        if built.get(rel) != version or not target.exists():
+                            target.write_bytes(compress(data))
+                    except OSError as e:
+                        print(f"⚠️ Could not write {target.name}: {e}")
+                        continue
+                    self._asset_encodings[rel].append(encoding)
+                if len(self._asset_encodings[rel]) == len(encoders):
+                    manifest[rel] = version
+            
+            if manifest != built:
+                try:
+                    manifest_path.write_text(json.dumps(manifest, indent=2))
+                except OSError as e:
+                    print(f"⚠️ Could not write {ASSET_MANIFEST}: {e}")
+            
+            with self.app.app_context():
+                page = render_template('dashboard.html', asset_url=self._asset_url).encode('utf-8')
+            self._dashboard_page = {'identity': page}
+            for encoding, _, compress in encoders:
+                self._dashboard_page[encoding] = compress(page)
+            self._dashboard_etag = self._body_entry(page)[1]
+        except Exception as e:
+            print(f"❌ Could not build dashboard assets: {e}")
+        finally:
+            self._assets_ready.set()
+    
+    def _asset_url(self, filename: str) -> str:
+        """URL of a static file, versioned by its content hash"""
+        return f"/assets/{filename}?v={self._asset_versions.get(filename, '')}"
+    
+    def _body_entry(self, body: bytes):
+        """Pair a response body with its ETag, as cached by _cached_body"""
+        return body, hashlib.blake2b(body, digest_size=8).hexdigest()
+    
+    def _cached_json(self, key, compute, **cache_options) -> Response:
+        """Serve a cached JSON payload with an ETag, honouring If-None-Match"""
+        return self._cached_body(key, lambda: dumps_json(compute()), 'application/json', **cache_options)
+    
+    def _cached_html(self, key, render, **cache_options) -> Response:
+        """Serve a cached server-rendered HTML fragment with an ETag"""
+        return self._cached_body(key, lambda: render().encode('utf-8'), 'text/html', **cache_options)
+    
+    def _cached_body(self, key, build, mimetype: str, **cache_options) -> Response:
+        """Serve a cached response body with an ETag, honouring If-None-Match"""
+        body, etag = self._cached(key, lambda: self._body_entry(build()), **cache_options)
+        return self._body_response(body, etag, mimetype)
+    
+    def _body_response(self, body: bytes, etag: str, mimetype: str) -> Response:
+        """Send a body with its ETag, or a 304 if the client has it"""
+        not_modified = self._not_modified(etag)
+        if not_modified:
+            return not_modified
+        
+        encoding = None
+        if len(body) >= COMPRESS_MIN_SIZE:
+            encoding = request.accept_encodings.best_match(list(self._body_encoders))
+        if encoding:
+            body = self._compressed_body(body, etag, encoding)
+        
+        response = Response(body, mimetype=mimetype)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+            etag = f"{etag}:{encoding}"
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = HTTP_CACHE_CONTROL
+        response.vary.add('Accept-Encoding')
+        return response
+    
+    def _compressed_body(self, body: bytes, etag: str, encoding: str) -> bytes:
+        """Compress a cached body, reusing an earlier result for the same ETag"""
+        key = (etag, encoding)
+        with self._cache_lock:
+            compressed = self._compressed.get(key)
+            if compressed is not None:
+                self._compressed.move_to_end(key)
+                return compressed
+        
+        compressed = self._body_encoders[encoding](body)
+        with self._cache_lock:
+            self._compressed[key] = compressed
+            while len(self._compressed) > COMPRESSED_CACHE_SIZE:
+                self._compressed.popitem(last=False)
+        return compressed
+    
+    def _statistics_entry(self):
+        """Cached statistics body and ETag"""
+        bucket_age = time.time() % STATS_BUCKET_SECONDS
+        return self._cached(
+            ('statistics',), lambda: self._body_entry(dumps_json(self._compute_statistics())),
+            ttl=bucket_age, stale_ttl=bucket_age + STATS_STALE_TTL,
+            max_age=STATS_BUCKET_SECONDS + STATS_STALE_TTL
+        )
+    
+    def _parse_cursor(self, value: Optional[str]) -> Optional[Tuple[str, int]]:
+        """Parse a keyset cursor "<scraped_at>,<id>" (ValueError if malformed)"""
+        if not value:
+            return None
+        scraped_at, article_id = value.rsplit(',', 1)
+        return scraped_at, int(article_id)
+    
+    def _format_cursor(self, article: Dict) -> str:
+        """Keyset cursor pointing just past the given article"""
+        return f"{article['scraped_at']},{article['id']}"
+    
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a new pooled SQLite connection"""
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+        for pragma in DB_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
+    def _database_exists(self) -> bool:
+        """Whether the database file exists, without a stat call once it does"""
+        if not self._db_exists:
+            self._db_exists = os.path.exists(DB_PATH)
+        return self._db_exists
+    
+    def _checkpoint_loop(self):
+        """Periodically checkpoint the WAL into the database and truncate it"""
+        conn = None
+        while True:
+            time.sleep(WAL_CHECKPOINT_INTERVAL)
+            if not self._database_exists():
+                continue
+            try:
+                if conn is None:
+                    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error as e:
+                print(f"⚠️ WAL checkpoint failed: {e}")
+    
+    @contextmanager
+    def _conn(self):
+        """Borrow a connection from the pool and return it when done"""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = self._pool_size < DB_POOL_SIZE
+                if can_open:
+                    self._pool_size += 1
+            if can_open:
+                try:
+                    conn = self._open_connection()
+                except Exception:
+                    with self._pool_lock:
+                        self._pool_size -= 1
+                    raise
+            else:
+                conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+    
+    def _cached(self, key, compute, ttl: float = CACHE_TTL, stale_ttl: Optional[float] = None,
+                max_age: Optional[float] = None):
+        """Return a cached value for key, recomputing it when expired"""
+        if max_age is None:
+            max_age = max(ttl, stale_ttl or 0)
+        
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry:
+                self._cache.move_to_end(key)
+            version = self._data_version
+        
+        if entry:
+            age = time.time() - entry['ts']
+            if age < ttl:
+                return entry['data']
+            if stale_ttl is not None and age < stale_ttl:
+                self._refresh_in_background(key, compute, max_age)
+                return entry['data']
+        
+        return self._compute_once(key, compute, version, max_age)
+    
+    def _compute_once(self, key, compute, version: int, max_age: float):
+        """Compute and cache a value once for all concurrent callers"""
+        with self._cache_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = {'done': threading.Event(), 'data': None, 'error': None}
+        
+        if not leader:
+            flight['done'].wait()
+            if flight['error'] is not None:
+                raise flight['error']
+            return flight['data']
+        
+        try:
+            flight['data'] = compute()
+            self._store_cached(key, flight['data'], version, max_age)
+            return flight['data']
+        except Exception as e:
+            flight['error'] = e
+            raise
+        finally:
+            with self._cache_lock:
+                self._inflight.pop(key, None)
+            flight['done'].set()
+    
+    def _store_cached(self, key, data, version: int, max_age: float = CACHE_TTL):
+        """Store a computed value unless the data changed while computing it"""
+        now = time.time()
+        with self._cache_lock:
+            if version != self._data_version:
+                return
+            
+            expired = [k for k, entry in self._cache.items() if now - entry['ts'] >= entry['max_age']]
+            for k in expired:
+                del self._cache[k]
+            self._cache[key] = {'data': data, 'ts': now, 'max_age': max_age}
+            self._cache.move_to_end(key)
+            while len(self._cache) > CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+    
+    def _refresh_in_background(self, key, compute, max_age: float):
+        """Recompute a stale cache entry on a daemon thread"""
+        with self._cache_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            version = self._data_version
+        
+        def refresh():
+            try:
+                self._store_cached(key, compute(), version, max_age)
+            except Exception as e:
+                print(f"⚠️ Background refresh of {key[0]} failed: {e}")
+            finally:
+                with self._cache_lock:
+                    self._refreshing.discard(key)
+        
+        threading.Thread(target=refresh, daemon=True).start()
+    
+    def _recent_summaries(self, hours: int, source: str = None, category: str = None) -> List[Dict]:
+        """Recent articles read through the pool, cached until the data changes (shared; do not modify)"""
+        def fetch():
+            with self._conn() as conn:
+                return list(self.agent.iter_recent_summaries(hours, source, category, conn=conn))
+        
+        return self._cached(('summaries', hours, source, category), fetch)
+    
+    def _trending(self, hours: int, limit: int) -> List[Dict]:
+        """Trending topics for a window, shared by the JSON and HTML endpoints"""
+        return self._cached(
+            ('trending_topics', hours, limit),
+            lambda: self.agent.get_trending_topics(hours, limit, articles=self._recent_summaries(hours))
+        )
+    
+    def _invalidate_caches(self):
+        """Drop cached payloads after the database changes"""
+        with self._cache_lock:
+            self._data_version += 1
+            self._cache.clear()
+    
+    def _has_summary_tables(self, conn: sqlite3.Connection) -> bool:
+        """Whether stats_meta and daily_stats exist (cached once they do)"""
+        if not self._summary_tables:
+            found = conn.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN ('stats_meta', 'daily_stats')"
+            ).fetchone()[0]
+            self._summary_tables = found == 2
+        return self._summary_tables
+    
+    def _compute_statistics(self) -> Dict:
+        """Run the statistics query against a pooled connection"""
+        recent_cutoff = datetime.now() - timedelta(hours=24)
+        # daily_stats dates are UTC (SQLite's DATE('now'))
+        trend_cutoff = (datetime.now(timezone.utc) - timedelta(days=TREND_DAYS)).date().isoformat()
+        
+        with self._conn() as conn:
+            sql = _STATISTICS_SQL if self._has_summary_tables(conn) else _STATISTICS_FALLBACK_SQL
+            rows = conn.execute(sql, (recent_cutoff, trend_cutoff)).fetchall()
+        
+        # Partition the tagged rows; the 24h total is the sum of the
+        # distribution, so it needs no query of its own
+        total_articles = 0
+        recent_articles = 0
+        source_counts = {}
+        category_counts = {}
+        daily_stats = []
+        for tag, key, source, count in rows:
+            if tag == 'dist':
+                recent_articles += count
+                source_counts[source] = source_counts.get(source, 0) + count
+                category_counts[key] = category_counts.get(key, 0) + count
+            elif tag == 'day':
+                daily_stats.append((key, count))
+            else:
+                total_articles = count
+        
+        return {
+            'total_articles': total_articles,
+            'recent_articles': recent_articles,
+            'source_distribution': [
+                {'source': source, 'count': count}
+                for source, count in sorted(source_counts.items(), key=lambda x: x[1], reverse=True)
+            ],
+            'category_distribution': [
+                {'category': category, 'count': count}
+                for category, count in sorted(category_counts.items(), key=lambda x: x[1], reverse=True)
+            ],
+            'daily_trend': [{'date': row[0], 'count': row[1]} for row in daily_stats]
+        }
     
     def setup_routes(self):
         """Setup Flask routes"""
@@ -58,35 +793,109 @@ class NewsAgentWebInterface:
         @self.app.route('/')
         def dashboard():
             """Main dashboard"""
-            return render_template('dashboard.html')
+            self._assets_ready.wait()
+            if not self._dashboard_page:
+                return self._json({'error': 'Dashboard page not available'}, 503)
+            
+            cache_control = f"public, max-age={DASHBOARD_MAX_AGE}"
+            not_modified = self._not_modified(self._dashboard_etag, weak=True, cache_control=cache_control)
+            if not_modified:
+                return not_modified
+            
+            encoding = request.accept_encodings.best_match([e for e in self._dashboard_page if e != 'identity'])
+            response = Response(self._dashboard_page[encoding or 'identity'], mimetype='text/html')
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+            response.set_etag(self._dashboard_etag, weak=True)
+            response.headers['Cache-Control'] = cache_control
+            response.vary.add('Accept-Encoding')
+            return response
+        
+        @self.app.route('/assets/<path:filename>')
+        def assets(filename):
+            """Static files, sent precompressed when the client accepts it"""
+            self._assets_ready.wait()
+            encoding = request.accept_encodings.best_match(self._asset_encodings.get(filename, []))
+            suffix = {'br': '.br', 'gzip': '.gz'}.get(encoding, '')
+            # Only the current content hash may be cached for a year; a stale
+            # ?v= from a cached page gets the new file revalidated each time
+            version = self._asset_versions.get(filename)
+            current = version is not None and request.args.get('v') == version
+            response = send_from_directory(
+                self.app.static_folder, filename + suffix,
+                mimetype=mimetypes.guess_type(filename)[0],
+                max_age=ASSET_MAX_AGE if current else None
+            )
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+            if current:
+                response.cache_control.immutable = True
+            else:
+                response.cache_control.no_cache = True
+            return response
         
         @self.app.route('/api/status')
         def api_status():
             """Get current status"""
-            return jsonify({
-                'agent_initialized': self.agent is not None,
-                'is_running': self.is_running,
-                'scheduler_active': self.scheduler is not None and getattr(self.scheduler, 'is_running', False),
-                'database_exists': os.path.exists('news_agent.db'),
-                'stats': self.current_stats
-            })
+            return self._json(self._status_payload())
+        
+        @self.app.route('/api/dashboard')
+        def api_dashboard():
+            """Status and statistics in one response"""
+            statistics = b'null'
+            if self._database_exists():
+                try:
+                    statistics, _ = self._statistics_entry()
+                except Exception as e:
+                    print(f"⚠️ Could not load statistics: {e}")
+            body = b'{"status":' + dumps_json(self._status_payload()) + b',"statistics":' + statistics + b'}'
+            return Response(body, mimetype='application/json')
         
         @self.app.route('/api/articles')
         def api_articles():
-            """Get recent articles"""
+            """Get recent articles, newest first, one page at a time"""
             hours = request.args.get('hours', 24, type=int)
             source = request.args.get('source', None)
             category = request.args.get('category', None)
+            limit = min(max(request.args.get('limit', ARTICLES_PAGE_SIZE, type=int), 1), ARTICLES_MAX_PAGE_SIZE)
             
             if not self.agent:
-                return jsonify({'error': 'Agent not initialized'}), 400
+                return self._json({'error': 'Agent not initialized'}, 400)
             
-            articles = self.agent.get_recent_summaries(hours, source, category)
-            return jsonify({
-                'articles': articles,
-                'total': len(articles),
-                'hours': hours
-            })
+            try:
+                after = self._parse_cursor(request.args.get('after'))
+            except ValueError:
+                return self._json({'error': 'Invalid cursor'}, 400)
+            
+            # The body is streamed, so derive a weak ETag from the data
+            # version and cache window instead of hashing the content
+            etag = hashlib.blake2b(
+                f"{self._data_version}:{request.full_path}:{int(time.time() // CACHE_TTL)}".encode(),
+                digest_size=8
+            ).hexdigest()
+            not_modified = self._not_modified(etag, weak=True)
+            if not_modified:
+                return not_modified
+            
+            def generate():
+                # Stream rows straight from the cursor instead of building
+                # the whole list (and its JSON) in memory
+                with self._conn() as conn:
+                    yield '{"hours": %d, "articles": [' % hours
+                    total = 0
+                    last = None
+                    for last in self.agent.iter_recent_summaries(hours, source, category, conn=conn,
+                                                                 limit=limit, after=after):
+                        yield (b', ' if total else b'') + dumps_json(last)
+                        total += 1
+                    next_cursor = self._format_cursor(last) if total == limit else None
+                    yield b'], "total": %d, "next_cursor": %s}' % (total, dumps_json(next_cursor))
+            
+            response = Response(stream_with_context(generate()), mimetype='application/json')
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = HTTP_CACHE_CONTROL
+            return response
         
         @self.app.route('/api/trending')
         def api_trending():
@@ -95,72 +904,67 @@ class NewsAgentWebInterface:
             limit = request.args.get('limit', 15, type=int)
             
             if not self.agent:
-                return jsonify({'error': 'Agent not initialized'}), 400
+                return self._json({'error': 'Agent not initialized'}, 400)
             
-            trending = self.agent.get_trending_topics(hours, limit)
-            return jsonify({
-                'trending': trending,
-                'hours': hours
-            })
+            return self._cached_json(
+                ('trending', hours, limit),
+                lambda: {'trending': self._trending(hours, limit), 'hours': hours}
+            )
+        
+        # Server-rendered fragments: the markup is built once per window and
+        # data version and shared by every client, instead of each browser
+        # rebuilding it from JSON
+        @self.app.route('/api/articles.html')
+        def api_articles_html():
+            """Recent article cards as an HTML fragment, one page at a time"""
+            hours = request.args.get('hours', 24, type=int)
+            limit = min(max(request.args.get('limit', ARTICLE_CARDS_PAGE_SIZE, type=int), 1), ARTICLES_MAX_PAGE_SIZE)
+            
+            if not self.agent:
+                return self._json({'error': 'Agent not initialized'}, 400)
+            
+            try:
+                after = self._parse_cursor(request.args.get('after'))
+            except ValueError:
+                return self._json({'error': 'Invalid cursor'}, 400)
+            
+            def render():
+                with self._conn() as conn:
+                    articles = list(self.agent.iter_recent_summaries(hours, conn=conn, limit=limit, after=after))
+                html = render_template('partials/articles.html', articles=articles, hours=hours, paged=after is not None)
+                next_cursor = self._format_cursor(articles[-1]) if len(articles) == limit else ''
+                return self._body_entry(html.encode('utf-8')) + (next_cursor,)
+            
+            body, etag, next_cursor = self._cached(('articles_html', hours, limit, after), render)
+            response = self._body_response(body, etag, 'text/html')
+            response.headers['X-Next-Cursor'] = next_cursor
+            return response
+        
+        @self.app.route('/api/trending.html')
+        def api_trending_html():
+            """Trending topics as an HTML fragment"""
+            hours = request.args.get('hours', 24, type=int)
+            limit = request.args.get('limit', 15, type=int)
+            
+            if not self.agent:
+                return self._json({'error': 'Agent not initialized'}, 400)
+            
+            return self._cached_html(
+                ('trending_html', hours, limit),
+                lambda: render_template('partials/trending.html', trending=self._trending(hours, limit))
+            )
         
         @self.app.route('/api/statistics')
         def api_statistics():
             """Get database statistics"""
-            if not os.path.exists('news_agent.db'):
-                return jsonify({'error': 'Database not found'}), 404
+            if not self._database_exists():
+                return self._json({'error': 'Database not found'}, 404)
             
             try:
-                conn = sqlite3.connect('news_agent.db')
-                
-                # Total articles
-                total_articles = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
-                
-                # Recent articles (24h)
-                recent_cutoff = datetime.now() - timedelta(hours=24)
-                recent_articles = conn.execute(
-                    "SELECT COUNT(*) FROM articles WHERE scraped_at > ?", 
-                    (recent_cutoff,)
-                ).fetchone()[0]
-                
-                # Source distribution
-                source_stats = conn.execute("""
-                    SELECT source, COUNT(*) as count 
-                    FROM articles 
-                    WHERE scraped_at > ? 
-                    GROUP BY source 
-                    ORDER BY count DESC
-                """, (recent_cutoff,)).fetchall()
-                
-                # Category distribution
-                category_stats = conn.execute("""
-                    SELECT category, COUNT(*) as count 
-                    FROM articles 
-                    WHERE scraped_at > ? 
-                    GROUP BY category 
-                    ORDER BY count DESC
-                """, (recent_cutoff,)).fetchall()
-                
-                # Daily trend (last 7 days)
-                daily_stats = conn.execute("""
-                    SELECT DATE(scraped_at) as date, COUNT(*) as count
-                    FROM articles
-                    WHERE scraped_at > DATE('now', '-7 days')
-                    GROUP BY DATE(scraped_at)
-                    ORDER BY date
-                """).fetchall()
-                
-                conn.close()
-                
-                return jsonify({
-                    'total_articles': total_articles,
-                    'recent_articles': recent_articles,
-                    'source_distribution': [{'source': row[0], 'count': row[1]} for row in source_stats],
-                    'category_distribution': [{'category': row[0], 'count': row[1]} for row in category_stats],
-                    'daily_trend': [{'date': row[0], 'count': row[1]} for row in daily_stats]
-                })
-                
+                body, etag = self._statistics_entry()
+                return self._body_response(body, etag, 'application/json')
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return self._json({'error': str(e)}, 500)
         
         @self.app.route('/api/initialize', methods=['POST'])
         def api_initialize():
@@ -180,60 +984,34 @@ class NewsAgentWebInterface:
                     huggingface_api_key=data.get('huggingface_api_key'),
                     config=config
                 )
+                self._db_exists = True
+                self._push_status()
                 
-                return jsonify({
+                return self._json({
                     'success': True,
                     'message': 'News agent initialized successfully',
                     'summarization_method': self.agent.summarization_method
                 })
                 
             except Exception as e:
-                return jsonify({
+                return self._json({
                     'success': False,
                     'error': str(e)
-                }), 500
+                }, 500)
         
         @self.app.route('/api/scrape', methods=['POST'])
         def api_scrape():
             """Start scraping cycle"""
             if not self.agent:
-                return jsonify({'error': 'Agent not initialized'}), 400
+                return self._json({'error': 'Agent not initialized'}, 400)
             
-            if self.is_running:
-                return jsonify({'error': 'Scraping already in progress'}), 400
+            if not self._try_start_run():
+                return self._json({'error': 'Scraping already in progress'}, 400)
             
-            # Start scraping in background thread
-            def run_scraping():
-                self.is_running = True
-                try:
-                    # Emit start event
-                    self.socketio.emit('scraping_started', {'message': 'Scraping started'})
-                    
-                    # Run scraping
-                    results = self.agent.run_complete_scraping_cycle()
-                    
-                    # Update stats
-                    self.current_stats = {
-                        'last_run': datetime.now().isoformat(),
-                        'total_articles': results['total_new_articles'],
-                        'processing_time': results['processing_time'],
-                        'summarization_method': results['summarization_method']
-                    }
-                    
-                    # Emit completion event
-                    self.socketio.emit('scraping_completed', {
-                        'results': results,
-                        'stats': self.current_stats
-                    })
-                    
-                except Exception as e:
-                    self.socketio.emit('scraping_error', {'error': str(e)})
-                finally:
-                    self.is_running = False
-            
-            threading.Thread(target=run_scraping, daemon=True).start()
+            self._job_queue.put_nowait(('scrape', {}))
+            self._push_status()
             
-            return jsonify({'success': True, 'message': 'Scraping started'})
+            return self._json({'success': True, 'message': 'Scraping started'}, 202)
         
         @self.app.route('/api/schedule', methods=['POST'])
         def api_schedule():
@@ -243,36 +1021,44 @@ class NewsAgentWebInterface:
             
             if action == 'start':
                 if not self.agent:
-                    return jsonify({'error': 'Agent not initialized'}), 400
+                    return self._json({'error': 'Agent not initialized'}, 400)
                 
-                if self.scheduler and getattr(self.scheduler, 'is_running', False):
-                    return jsonify({'error': 'Scheduler already running'}), 400
-                
-                interval_hours = data.get('interval_hours', 2)
+                try:
+                    interval_hours = float(data.get('interval_hours', 2))
+                except (TypeError, ValueError):
+                    interval_hours = 0
+                if not 0 < interval_hours < float('inf'):
+                    return self._json({'error': 'interval_hours must be a positive number'}, 400)
                 
-                def run_scheduler():
-                    self.scheduler = EnhancedNewsScheduler(self.agent)
-                    self.scheduler.start_scheduler(interval_hours=interval_hours)
+                with self._state_lock:
+                    if self._next_scheduled_run is not None:
+                        return self._json({'error': 'Scheduler already running'}, 400)
+                    self._schedule_interval = interval_hours
+                    self._next_scheduled_run = time.time() + interval_hours * 3600
                 
-                threading.Thread(target=run_scheduler, daemon=True).start()
+                # Wake the worker so it starts waiting for the first tick
+                self._job_queue.put_nowait(('schedule', {}))
+                self._push_status()
                 
-                return jsonify({
+                return self._json({
                     'success': True,
-                    'message': f'Scheduler started (every {interval_hours} hours)'
+                    'message': f'Scheduler started (every {interval_hours:g} hours)'
                 })
             
             elif action == 'stop':
-                if self.scheduler:
-                    self.scheduler.is_running = False
-                    self.scheduler = None
+                with self._state_lock:
+                    self._next_scheduled_run = None
+                    self._schedule_interval = None
+                self._job_queue.put_nowait(('schedule', {}))
+                self._push_status()
                 
-                return jsonify({
+                return self._json({
                     'success': True,
                     'message': 'Scheduler stopped'
                 })
             
             else:
-                return jsonify({'error': 'Invalid action'}), 400
+                return self._json({'error': 'Invalid action'}, 400)
         
         @self.app.route('/api/export')
         def api_export():
@@ -281,17 +1067,40 @@ class NewsAgentWebInterface:
             format_type = request.args.get('format', 'json')
             
             if not self.agent:
-                return jsonify({'error': 'Agent not initialized'}), 400
+                return self._json({'error': 'Agent not initialized'}, 400)
             
             try:
                 if format_type == 'json':
-                    filename = self.agent.export_to_json(hours=hours)
-                    return send_file(filename, as_attachment=True)
+                    filename = f"news_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                    
+                    def generate():
+                        with self._conn() as conn:
+                            yield from self.agent.iter_export_json(hours, conn=conn)
+                    
+                    return Response(
+                        stream_with_context(generate()),
+                        mimetype='application/json',
+                        headers={'Content-Disposition': f'attachment; filename={filename}'}
+                    )
+                elif format_type == 'ndjson':
+                    # One article per line, so clients can write or parse
+                    # the export as it arrives
+                    filename = f"news_export_{datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson"
+                    
+                    def generate():
+                        with self._conn() as conn:
+                            yield from self.agent.iter_export_ndjson(hours, conn=conn)
+                    
+                    return Response(
+                        stream_with_context(generate()),
+                        mimetype='application/x-ndjson',
+                        headers={'Content-Disposition': f'attachment; filename={filename}'}
+                    )
                 else:
-                    return jsonify({'error': 'Unsupported format'}), 400
+                    return self._json({'error': 'Unsupported format'}, 400)
                     
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return self._json({'error': str(e)}, 500)
         
         @self.app.route('/api/report')
         def api_report():
@@ -299,16 +1108,23 @@ class NewsAgentWebInterface:
             hours = request.args.get('hours', 24, type=int)
             
             if not self.agent:
-                return jsonify({'error': 'Agent not initialized'}), 400
+                return self._json({'error': 'Agent not initialized'}, 400)
             
             try:
-                report = self.agent.generate_comprehensive_report(hours)
-                return jsonify({
-                    'report': report,
-                    'hours': hours
-                })
+                # Cached per window until the next scrape or cleanup bumps
+                # the data version, so repeat clicks return immediately
+                return self._cached_json(
+                    ('report', hours),
+                    lambda: {
+                        'report': self.agent.generate_comprehensive_report(
+                            hours, articles=self._recent_summaries(hours)
+                        ),
+                        'hours': hours
+                    },
+                    ttl=REPORT_CACHE_TTL
+                )
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return self._json({'error': str(e)}, 500)
         
         @self.app.route('/api/cleanup', methods=['POST'])
         def api_cleanup():
@@ -317,17 +1133,22 @@ class NewsAgentWebInterface:
             days = data.get('days', 30)
             
             if not self.agent:
-                return jsonify({'error': 'Agent not initialized'}), 400
+                return self._json({'error': 'Agent not initialized'}, 400)
             
             try:
                 deleted_count = self.agent.cleanup_old_articles(days)
-                return jsonify({
+                if deleted_count:
+                    self._invalidate_caches()
+                    if not os.path.exists(DB_PATH):
+                        self._db_exists = False
+                    self._push_statistics()
+                return self._json({
                     'success': True,
                     'deleted_count': deleted_count,
                     'days': days
                 })
             except Exception as e:
-                return jsonify({'error': str(e)}), 500
+                return self._json({'error': str(e)}, 500)
     
     def setup_socketio_events(self):
         """Setup SocketIO events for real-time updates"""
@@ -335,729 +1156,24 @@ class NewsAgentWebInterface:
         @self.socketio.on('connect')
         def handle_connect():
             print('Client connected')
-            emit('status_update', {
-                'agent_initialized': self.agent is not None,
-                'is_running': self.is_running,
-                'stats': self.current_stats
-            })
+            emit('status_update', self._status_payload())
         
         @self.socketio.on('disconnect')
         def handle_disconnect():
             print('Client disconnected')
     
-    def create_templates(self):
-        """Create HTML templates"""
-        # Create templates directory
-        templates_dir = Path('templates')
-        templates_dir.mkdir(exist_ok=True)
-        
-        # Main dashboard template
-        dashboard_html = '''<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>News Agent Dashboard</title>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/socket.io/4.7.2/socket.io.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css" rel="stylesheet">
-    <style>
-        .status-indicator {
-            width: 12px;
-            height: 12px;
-            border-radius: 50%;
-            display: inline-block;
-            margin-right: 8px;
-        }
-        .status-online { background-color: #28a745; }
-        .status-offline { background-color: #dc3545; }
-        .status-running { background-color: #ffc107; animation: pulse 2s infinite; }
-        @keyframes pulse {
-            0% { opacity: 1; }
-            50% { opacity: 0.5; }
-            100% { opacity: 1; }
-        }
-        .card-header {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-        }
-        .metric-card {
-            background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-            color: white;
-            border: none;
-        }
-        .btn-primary {
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            border: none;
-        }
-        .article-card {
-            transition: transform 0.2s;
-            border-left: 4px solid #667eea;
-        }
-        .article-card:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        }
-        .log-container {
-            background: #1a1a1a;
-            color: #00ff00;
-            font-family: 'Courier New', monospace;
-            height: 300px;
-            overflow-y: auto;
-            padding: 15px;
-            border-radius: 5px;
-        }
-    </style>
-</head>
-<body class="bg-light">
-    <!-- Navigation -->
-    <nav class="navbar navbar-expand-lg navbar-dark" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);">
-        <div class="container">
-            <a class="navbar-brand" href="#"><i class="fas fa-newspaper"></i> News Agent Dashboard</a>
-            <div class="ms-auto">
-                <span class="badge bg-light text-dark me-2">
-                    <span id="status-indicator" class="status-indicator status-offline"></span>
-                    <span id="status-text">Offline</span>
-                </span>
-                <span class="badge bg-light text-dark" id="last-update">Never</span>
-            </div>
-        </div>
-    </nav>
-
-    <div class="container mt-4">
-        <!-- Control Panel -->
-        <div class="row mb-4">
-            <div class="col-12">
-                <div class="card">
-                    <div class="card-header">
-                        <h5 class="mb-0"><i class="fas fa-cogs"></i> Control Panel</h5>
-                    </div>
-                    <div class="card-body">
-                        <div class="row">
-                            <div class="col-md-4">
-                                <button class="btn btn-primary w-100 mb-2" onclick="initializeAgent()">
-                                    <i class="fas fa-power-off"></i> Initialize Agent
-                                </button>
-                                <button class="btn btn-success w-100 mb-2" onclick="startScraping()" id="scrape-btn">
-                                    <i class="fas fa-play"></i> Start Scraping
-                                </button>
-                            </div>
-                            <div class="col-md-4">
-                                <button class="btn btn-warning w-100 mb-2" onclick="toggleScheduler()" id="schedule-btn">
-                                    <i class="fas fa-clock"></i> Start Scheduler
-                                </button>
-                                <button class="btn btn-info w-100 mb-2" onclick="generateReport()">
-                                    <i class="fas fa-file-alt"></i> Generate Report
-                                </button>
-                            </div>
-                            <div class="col-md-4">
-                                <button class="btn btn-secondary w-100 mb-2" onclick="exportData()">
-                                    <i class="fas fa-download"></i> Export Data
-                                </button>
-                                <button class="btn btn-danger w-100 mb-2" onclick="cleanupData()">
-                                    <i class="fas fa-trash"></i> Cleanup Old Data
-                                </button>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <!-- Statistics Cards -->
-        <div class="row mb-4">
-            <div class="col-md-3">
-                <div class="card metric-card">
-                    <div class="card-body text-center">
-                        <i class="fas fa-newspaper fa-2x mb-2"></i>
-                        <h3 id="total-articles">0</h3>
-                        <p class="mb-0">Total Articles</p>
-                    </div>
-                </div>
-            </div>
-            <div class="col-md-3">
-                <div class="card metric-card">
-                    <div class="card-body text-center">
-                        <i class="fas fa-clock fa-2x mb-2"></i>
-                        <h3 id="recent-articles">0</h3>
-                        <p class="mb-0">Last 24h</p>
-                    </div>
-                </div>
-            </div>
-            <div class="col-md-3">
-                <div class="card metric-card">
-                    <div class="card-body text-center">
-                        <i class="fas fa-chart-line fa-2x mb-2"></i>
-                        <h3 id="processing-time">0s</h3>
-                        <p class="mb-0">Last Processing</p>
-                    </div>
-                </div>
-            </div>
-            <div class="col-md-3">
-                <div class="card metric-card">
-                    <div class="card-body text-center">
-                        <i class="fas fa-brain fa-2x mb-2"></i>
-                        <h3 id="summarization-method">Local</h3>
-                        <p class="mb-0">AI Method</p>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <!-- Charts Row -->
-        <div class="row mb-4">
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        <h5 class="mb-0"><i class="fas fa-chart-pie"></i> Sources Distribution</h5>
-                    </div>
-                    <div class="card-body">
-                        <canvas id="sourcesChart" height="200"></canvas>
-                    </div>
-                </div>
-            </div>
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        <h5 class="mb-0"><i class="fas fa-chart-line"></i> Daily Trend</h5>
-                    </div>
-                    <div class="card-body">
-                        <canvas id="trendChart" height="200"></canvas>
-                    </div>
-                </div>
-            </div>
-        </div>
-
-        <!-- Content Tabs -->
-        <div class="row">
-            <div class="col-12">
-                <ul class="nav nav-tabs" id="contentTabs" role="tablist">
-                    <li class="nav-item" role="presentation">
-                        <button class="nav-link active" id="articles-tab" data-bs-toggle="tab" data-bs-target="#articles" type="button">
-                            <i class="fas fa-newspaper"></i> Recent Articles
-                        </button>
-                    </li>
-                    <li class="nav-item" role="presentation">
-                        <button class="nav-link" id="trending-tab" data-bs-toggle="tab" data-bs-target="#trending" type="button">
-                            <i class="fas fa-fire"></i> Trending Topics
-                        </button>
-                    </li>
-                    <li class="nav-item" role="presentation">
-                        <button class="nav-link" id="logs-tab" data-bs-toggle="tab" data-bs-target="#logs" type="button">
-                            <i class="fas fa-terminal"></i> Live Logs
-                        </button>
-                    </li>
-                </ul>
-                <div class="tab-content" id="contentTabsContent">
-                    <!-- Articles Tab -->
-                    <div class="tab-pane fade show active" id="articles" role="tabpanel">
-                        <div class="card">
-                            <div class="card-body">
-                                <div class="d-flex justify-content-between align-items-center mb-3">
-                                    <h5 class="mb-0">Recent Articles</h5>
-                                    <button class="btn btn-outline-primary btn-sm" onclick="refreshArticles()">
-                                        <i class="fas fa-refresh"></i> Refresh
-                                    </button>
-                                </div>
-                                <div id="articles-container">
-                                    <p class="text-muted text-center py-4">No articles loaded. Initialize agent and start scraping to see articles.</p>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-
-                    <!-- Trending Tab -->
-                    <div class="tab-pane fade" id="trending" role="tabpanel">
-                        <div class="card">
-                            <div class="card-body">
-                                <div class="d-flex justify-content-between align-items-center mb-3">
-                                    <h5 class="mb-0">Trending Topics</h5>
-                                    <button class="btn btn-outline-primary btn-sm" onclick="refreshTrending()">
-                                        <i class="fas fa-refresh"></i> Refresh
-                                    </button>
-                                </div>
-                                <div id="trending-container">
-                                    <p class="text-muted text-center py-4">No trending data available.</p>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-
-                    <!-- Logs Tab -->
-                    <div class="tab-pane fade" id="logs" role="tabpanel">
-                        <div class="card">
-                            <div class="card-body">
-                                <h5 class="mb-3">Live Activity Logs</h5>
-                                <div class="log-container" id="logs-container">
-                                    <div>News Agent Dashboard - Ready</div>
-                                    <div>Waiting for agent initialization...</div>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-    </div>
-
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
-    <script>
-        // Global variables
-        let socket = null;
-        let sourcesChart = null;
-        let trendChart = null;
-        let isSchedulerRunning = false;
-
-        // Initialize dashboard
-        document.addEventListener('DOMContentLoaded', function() {
-            initializeSocket();
-            initializeCharts();
-            loadStatus();
-            loadStatistics();
-        });
-
-        // Socket.IO connection
-        function initializeSocket() {
-            socket = io();
-            
-            socket.on('connect', function() {
-                addLog('Connected to News Agent server');
-                updateStatus('Connected', 'online');
-            });
-            
-            socket.on('disconnect', function() {
-                addLog('Disconnected from server');
-                updateStatus('Disconnected', 'offline');
-            });
-            
-            socket.on('scraping_started', function(data) {
-                addLog('Scraping cycle started...');
-                updateStatus('Scraping', 'running');
-                document.getElementById('scrape-btn').disabled = true;
-            });
-            
-            socket.on('scraping_completed', function(data) {
-                addLog(`Scraping completed: ${data.results.total_new_articles} articles found`);
-                updateStatus('Online', 'online');
-                document.getElementById('scrape-btn').disabled = false;
-                
-                // Update statistics
-                loadStatistics();
-                refreshArticles();
-            });
-            
-            socket.on('scraping_error', function(data) {
-                addLog(`Scraping error: ${data.error}`);
-                updateStatus('Error', 'offline');
-                document.getElementById('scrape-btn').disabled = false;
-            });
-        }
-
-        // Initialize charts
-        function initializeCharts() {
-            // Sources pie chart
-            const sourcesCtx = document.getElementById('sourcesChart').getContext('2d');
-            sourcesChart = new Chart(sourcesCtx, {
-                type: 'doughnut',
-                data: {
-                    labels: [],
-                    datasets: [{
-                        data: [],
-                        backgroundColor: [
-                            '#FF6384', '#36A2EB', '#FFCE56', '#4BC0C0', '#9966FF', '#FF9F40'
-                        ]
-                    }]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    plugins: {
-                        legend: {
-                            position: 'bottom'
-                        }
-                    }
-                }
-            });
-
-            // Daily trend line chart
-            const trendCtx = document.getElementById('trendChart').getContext('2d');
-            trendChart = new Chart(trendCtx, {
-                type: 'line',
-                data: {
-                    labels: [],
-                    datasets: [{
-                        label: 'Articles per Day',
-                        data: [],
-                        borderColor: '#667eea',
-                        backgroundColor: 'rgba(102, 126, 234, 0.1)',
-                        tension: 0.1
-                    }]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {
-                        y: {
-                            beginAtZero: true
-                        }
-                    }
-                }
-            });
-        }
-
-        // Update status indicator
-        function updateStatus(text, status) {
-            document.getElementById('status-text').textContent = text;
-            const indicator = document.getElementById('status-indicator');
-            indicator.className = `status-indicator status-${status}`;
-            document.getElementById('last-update').textContent = new Date().toLocaleTimeString();
-        }
-
-        // Add log entry
-        function addLog(message) {
-            const container = document.getElementById('logs-container');
-            const timestamp = new Date().toLocaleTimeString();
-            const logEntry = document.createElement('div');
-            logEntry.innerHTML = `[${timestamp}] ${message}`;
-            container.appendChild(logEntry);
-            container.scrollTop = container.scrollHeight;
-        }
-
-        // API functions
-        async function loadStatus() {
-            try {
-                const response = await fetch('/api/status');
-                const data = await response.json();
-                
-                if (data.agent_initialized) {
-                    updateStatus('Online', 'online');
-                    addLog('Agent is initialized and ready');
-                } else {
-                    updateStatus('Agent Not Initialized', 'offline');
-                }
-                
-                if (data.stats.last_run) {
-                    document.getElementById('processing-time').textContent = 
-                        data.stats.processing_time ? `${data.stats.processing_time.toFixed(1)}s` : '0s';
-                }
-                
-            } catch (error) {
-                console.error('Error loading status:', error);
-                updateStatus('Error', 'offline');
-            }
-        }
-
-        async function loadStatistics() {
-            try {
-                const response = await fetch('/api/statistics');
-                const data = await response.json();
-                
-                // Update metric cards
-                document.getElementById('total-articles').textContent = data.total_articles || 0;
-                document.getElementById('recent-articles').textContent = data.recent_articles || 0;
-                
-                // Update charts
-                if (data.source_distribution) {
-                    sourcesChart.data.labels = data.source_distribution.map(s => s.source.replace('_', ' ').toUpperCase());
-                    sourcesChart.data.datasets[0].data = data.source_distribution.map(s => s.count);
-                    sourcesChart.update();
-                }
-                
-                if (data.daily_trend) {
-                    trendChart.data.labels = data.daily_trend.map(d => d.date);
-                    trendChart.data.datasets[0].data = data.daily_trend.map(d => d.count);
-                    trendChart.update();
-                }
-                
-            } catch (error) {
-                console.error('Error loading statistics:', error);
-            }
-        }
-
-        async function initializeAgent() {
-            const openaiKey = prompt('OpenAI API Key (optional, leave empty for local summarization):');
-            const hfKey = prompt('Hugging Face API Key (optional):');
-            
-            try {
-                const response = await fetch('/api/initialize', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json'
-                    },
-                    body: JSON.stringify({
-                        openai_api_key: openaiKey || undefined,
-                        huggingface_api_key: hfKey || undefined,
-                        max_articles_per_page: 5,
-                        enable_logging: true
-                    })
-                });
-                
-                const data = await response.json();
-                
-                if (data.success) {
-                    addLog('Agent initialized successfully');
-                    updateStatus('Online', 'online');
-                    document.getElementById('summarization-method').textContent = 
-                        data.summarization_method || 'Local';
-                } else {
-                    addLog(`Initialization failed: ${data.error}`);
-                    alert(`Error: ${data.error}`);
-                }
-                
-            } catch (error) {
-                console.error('Error initializing agent:', error);
-                addLog(`Initialization error: ${error.message}`);
-            }
-        }
-
-        async function startScraping() {
-            try {
-                const response = await fetch('/api/scrape', {
-                    method: 'POST'
-                });
-                
-                const data = await response.json();
-                
-                if (!data.success) {
-                    alert(`Error: ${data.error}`);
-                }
-                
-            } catch (error) {
-                console.error('Error starting scraping:', error);
-                addLog(`Scraping error: ${error.message}`);
-            }
-        }
-
-        async function toggleScheduler() {
-            const action = isSchedulerRunning ? 'stop' : 'start';
-            let intervalHours = 2;
-            
-            if (action === 'start') {
-                const input = prompt('Run every X hours:', '2');
-                intervalHours = parseInt(input) || 2;
-            }
-            
-            try {
-                const response = await fetch('/api/schedule', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json'
-                    },
-                    body: JSON.stringify({
-                        action: action,
-                        interval_hours: intervalHours
-                    })
-                });
-                
-                const data = await response.json();
-                
-                if (data.success) {
-                    isSchedulerRunning = !isSchedulerRunning;
-                    const btn = document.getElementById('schedule-btn');
-                    btn.innerHTML = isSchedulerRunning ? 
-                        '<i class="fas fa-stop"></i> Stop Scheduler' : 
-                        '<i class="fas fa-clock"></i> Start Scheduler';
-                    btn.className = isSchedulerRunning ? 'btn btn-danger w-100 mb-2' : 'btn btn-warning w-100 mb-2';
-                    addLog(data.message);
-                } else {
-                    alert(`Error: ${data.error}`);
-                }
-                
-            } catch (error) {
-                console.error('Error with scheduler:', error);
-                addLog(`Scheduler error: ${error.message}`);
-            }
-        }
-
-        async function refreshArticles() {
-            try {
-                const response = await fetch('/api/articles?hours=24');
-                const data = await response.json();
-                
-                const container = document.getElementById('articles-container');
-                
-                if (data.articles && data.articles.length > 0) {
-                    container.innerHTML = data.articles.map(article => `
-                        <div class="article-card card mb-3">
-                            <div class="card-body">
-                                <div class="d-flex justify-content-between align-items-start mb-2">
-                                    <h6 class="card-title mb-1">${article.title}</h6>
-                                    <small class="text-muted">${article.source.toUpperCase()}</small>
-                                </div>
-                                <p class="card-text text-muted small mb-2">${article.summary}</p>
-                                <div class="d-flex justify-content-between align-items-center">
-                                    <div>
-                                        <span class="badge bg-secondary me-1">${article.category}</span>
-                                        <span class="badge bg-info">${article.reading_time || 1} min read</span>
-                                    </div>
-                                    <a href="${article.url}" target="_blank" class="btn btn-outline-primary btn-sm">
-                                        <i class="fas fa-external-link-alt"></i> Read
-                                    </a>
-                                </div>
-                            </div>
-                        </div>
-                    `).join('');
-                } else {
-                    container.innerHTML = '<p class="text-muted text-center py-4">No articles found in the last 24 hours.</p>';
-                }
-                
-            } catch (error) {
-                console.error('Error loading articles:', error);
-                addLog(`Error loading articles: ${error.message}`);
-            }
-        }
-
-        async function refreshTrending() {
-            try {
-                const response = await fetch('/api/trending?hours=24&limit=15');
-                const data = await response.json();
-                
-                const container = document.getElementById('trending-container');
-                
-                if (data.trending && data.trending.length > 0) {
-                    container.innerHTML = `
-                        <div class="row">
-                            ${data.trending.map((topic, index) => `
-                                <div class="col-md-6 mb-3">
-                                    <div class="card h-100">
-                                        <div class="card-body d-flex align-items-center">
-                                            <div class="me-3">
-                                                <h4 class="text-primary mb-0">#${index + 1}</h4>
-                                            </div>
-                                            <div class="flex-grow-1">
-                                                <h6 class="mb-1">${topic.topic}</h6>
-                                                <small class="text-muted">${topic.frequency} mentions (${topic.percentage}%)</small>
-                                            </div>
-                                        </div>
-                                    </div>
-                                </div>
-                            `).join('')}
-                        </div>
-                    `;
-                } else {
-                    container.innerHTML = '<p class="text-muted text-center py-4">No trending topics available.</p>';
-                }
-                
-            } catch (error) {
-                console.error('Error loading trending topics:', error);
-                addLog(`Error loading trending: ${error.message}`);
-            }
-        }
-
-        async function generateReport() {
-            const hours = prompt('Generate report for last X hours:', '24');
-            const hoursNum = parseInt(hours) || 24;
-            
-            try {
-                const response = await fetch(`/api/report?hours=${hoursNum}`);
-                const data = await response.json();
-                
-                if (data.report) {
-                    // Create modal or new window to show report
-                    const reportWindow = window.open('', '_blank');
-                    reportWindow.document.write(`
-                        <html>
-                            <head><title>News Report</title></head>
-                            <body style="font-family: monospace; white-space: pre-wrap; padding: 20px;">
-                                ${data.report}
-                            </body>
-                        </html>
-                    `);
-                    addLog(`Report generated for last ${hoursNum} hours`);
-                } else {
-                    alert(`Error: ${data.error}`);
-                }
-                
-            } catch (error) {
-                console.error('Error generating report:', error);
-                addLog(`Report error: ${error.message}`);
-            }
-        }
-
-        async function exportData() {
-            const hours = prompt('Export data from last X hours:', '24');
-            const hoursNum = parseInt(hours) || 24;
-            
-            try {
-                const response = await fetch(`/api/export?hours=${hoursNum}&format=json`);
-                
-                if (response.ok) {
-                    const blob = await response.blob();
-                    const url = window.URL.createObjectURL(blob);
-                    const a = document.createElement('a');
-                    a.style.display = 'none';
-                    a.href = url;
-                    a.download = `news_export_${new Date().toISOString().slice(0,10)}.json`;
-                    document.body.appendChild(a);
-                    a.click();
-                    window.URL.revokeObjectURL(url);
-                    addLog(`Data exported for last ${hoursNum} hours`);
-                } else {
-                    const error = await response.json();
-                    alert(`Export error: ${error.error}`);
-                }
-                
-            } catch (error) {
-                console.error('Error exporting data:', error);
-                addLog(`Export error: ${error.message}`);
-            }
-        }
-
-        async function cleanupData() {
-            const days = prompt('Delete articles older than X days:', '30');
-            const daysNum = parseInt(days) || 30;
-            
-            if (confirm(`This will permanently delete all articles older than ${daysNum} days. Continue?`)) {
-                try {
-                    const response = await fetch('/api/cleanup', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json'
-                        },
-                        body: JSON.stringify({
-                            days: daysNum
-                        })
-                    });
-                    
-                    const data = await response.json();
-                    
-                    if (data.success) {
-                        addLog(`Cleanup completed: ${data.deleted_count} articles deleted`);
-                        loadStatistics();
-                    } else {
-                        alert(`Error: ${data.error}`);
-                    }
-                    
-                } catch (error) {
-                    console.error('Error during cleanup:', error);
-                    addLog(`Cleanup error: ${error.message}`);
-                }
-            }
-        }
-
-        // Auto-refresh data every 30 seconds
-        setInterval(function() {
-            loadStatus();
-            loadStatistics();
-        }, 30000);
-    </script>
-</body>
-</html>'''
-        
-        with open(templates_dir / 'dashboard.html', 'w', encoding='utf-8') as f:
-            f.write(dashboard_html)
-    
     def run(self, host='127.0.0.1', port=5000, debug=False):
         """Run the web dashboard"""
-        # Create templates
-        self.create_templates()
+        raise_open_file_limit()
+        self._assets_ready.wait()
         
         print("🌐 NEWS AGENT WEB DASHBOARD")
         print("=" * 50)
         print(f"🚀 Starting web server...")
         print(f"📱 Access dashboard at: http://{host}:{port}")
         print(f"🔧 Debug mode: {'Enabled' if debug else 'Disabled'}")
+        if SOCKETIO_MESSAGE_QUEUE:
+            print(f"📡 SocketIO message queue: {SOCKETIO_MESSAGE_QUEUE}")
         print("🛑 Press Ctrl+C to stop")
         print("=" * 50)
         
@@ -1068,6 +1184,11 @@ class NewsAgentWebInterface:
         except Exception as e:
             print(f"\n❌ Error running web dashboard: {e}")
 
+def create_app():
+    """Build the dashboard and return its Flask app (the gunicorn entry point)"""
+    raise_open_file_limit()
+    return NewsAgentWebInterface().app
+
 def main():
     """Main function to run web dashboard"""
     if not FLASK_AVAILABLE: